@@ -1,25 +1,25 @@
-from flask import Flask, render_template, request, redirect, session, flash, url_for
-from psycopg2.extras import RealDictCursor
+from flask import Flask, render_template, request, redirect, session, flash, url_for, abort, Response, stream_with_context
 from authlib.integrations.flask_client import OAuth,OAuthError
 from dotenv import load_dotenv
 import os
+import re
+import json
+import hashlib
+from decimal import Decimal
 import psycopg2
-from utils.db import get_db
+from werkzeug.http import is_resource_modified
+from utils.db import get_db, init_app as init_db, pool_stats
 from utils.security import validate_password, hash_password, check_password
-from utils.supabase_client import supabase
+from utils.repositories import InternshipRepository, UserRepository, SavedRepository, INTERNSHIP_DETAIL_COLUMNS, RANGE_FILTERS
+from utils.pagination import decode_cursor, encode_cursor, CREATED_AT_ID, RANK_ID, BIGINT_MAX
+from utils.normalize import STIPEND_MAX, DURATION_MAX_MONTHS
+from utils.catalog import get_catalog_meta
+from utils.facets import get_facet_index
+from utils.response_cache import cached_page
+from utils.saved_buffer import get_saved_buffer, ACTIONS
+from utils.saved_cache import get_saved_ids, record_saved_ops
 from utils.profile_utils import is_profile_complete
-from utils.recommendation_utils import get_internship_recommendations
-
-
-def fetch_all_internships():
-    response = (
-        supabase
-        .table("internships")
-        .select("*")
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return response.data
+from utils.recommendation_utils import get_internship_recommendations, warm_skill_index
 
 
 # ---------------- LOAD ENV ----------------
@@ -27,6 +27,14 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = "dev-secret"
 
+# ---------------- DB POOL ----------------
+# One pooled connection per request, returned in teardown_appcontext
+init_db(app)
+
+# ---------------- SKILL INDEX ----------------
+# Per-worker inverted index used by the dashboard recommendations
+warm_skill_index()
+
 # ---------------- OAUTH SETUP ----------------
 oauth = OAuth(app)
 
@@ -53,47 +61,23 @@ def login():
         username = request.form["username"].lower()
         password = request.form["password"]
 
-        conn = get_db()
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            SELECT id, password_hash
-            FROM users
-            WHERE username = %s
-              AND auth_provider = 'local'
-              AND is_active = true
-            """,
-            (username,)
-        )
-
-        user = cur.fetchone()
-        cur.close()
-        conn.close()
+        users = UserRepository(get_db())
+        user = users.get_local_login(username)
 
-        if not user or not check_password(password, user[1]):
+        if not user or not check_password(password, user["password_hash"]):
             flash("Invalid credentials")
             return redirect("/login")
 
         # FIX: This was commented out, which broke the login session. 
         # Uncommented and casting ID to string for consistency.
-        session["user_id"] = str(user[0])
+        session["user_id"] = str(user["id"])
         user_id = session.get("user_id")
         
         # if not user_id:
         #     return redirect(url_for("login"))
         
         #get user name for displaying on dashboard:
-        conn = get_db()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-
-        cur.execute(
-            "SELECT display_name FROM users WHERE id = %s",
-            (user_id,)
-        )
-
-        user_row = cur.fetchone()
-        display_name = user_row["display_name"] if user_row else ""
+        display_name = users.get_display_name(user_id) or ""
         display_name=display_name.split()[0].capitalize()
 
         # FIX: Save display_name to session so it persists after redirect
@@ -157,31 +141,15 @@ def signup():
             return redirect("/signup")
 
         conn = get_db()
-        cur = conn.cursor()
+        users = UserRepository(conn)
 
-        cur.execute(
-            "SELECT id FROM users WHERE username = %s",
-            (username,)
-        )
-        if cur.fetchone():
+        if users.username_exists(username):
             flash("Username already exists.", "signup_error")
-            cur.close()
-            conn.close()
             return redirect("/signup")
 
-        cur.execute(
-            """
-            INSERT INTO users (username, display_name, password_hash, auth_provider)
-            VALUES (%s, %s, %s, 'local')
-            RETURNING id, display_name
-            """,
-            (username, username, hash_password(password))
-        )
-
-        user_id, display_name = cur.fetchone()
+        user = users.create_local(username, hash_password(password))
         conn.commit()
-        cur.close()
-        conn.close()
+        user_id, display_name = user["id"], user["display_name"]
         display_name=display_name.split()[0].capitalize()
 
         session["user_id"] = str(user_id)
@@ -228,31 +196,23 @@ def google_callback():
     conn = None
     try:
         conn = get_db()
-        cur = conn.cursor()
+        users = UserRepository(conn)
 
         # 3️⃣ DATABASE LOGIC (Upsert / Check-Exist Pattern)
         
         # First, check if user exists
-        cur.execute("SELECT id, display_name FROM users WHERE email = %s", (email,))
-        row = cur.fetchone()
+        row = users.get_by_email(email)
 
         if row:
             # --- SCENARIO A: Existing User ---
-            user_id, db_display_name = row
-            display_name = db_display_name # Use the name we have in DB
+            user_id = row["id"]
+            display_name = row["display_name"] # Use the name we have in DB
             print(f"✅ Existing user logged in: {email}")
         else:
             # --- SCENARIO B: New User ---
             try:
-                cur.execute(
-                    """
-                    INSERT INTO users (email, display_name, auth_provider)
-                    VALUES (%s, %s, 'google')
-                    RETURNING id, display_name
-                    """,
-                    (email, display_name)
-                )
-                user_id, display_name = cur.fetchone()
+                row = users.create_google(email, display_name)
+                user_id, display_name = row["id"], row["display_name"]
                 conn.commit() # Commit immediately after creation
                 print(f"🎉 New user created: {email}")
 
@@ -261,8 +221,8 @@ def google_callback():
                 # If 2 requests happen at once, the INSERT fails because email exists.
                 # We catch this error, rollback the failed insert, and just select the user.
                 conn.rollback()
-                cur.execute("SELECT id, display_name FROM users WHERE email = %s", (email,))
-                user_id, display_name = cur.fetchone()
+                row = users.get_by_email(email)
+                user_id, display_name = row["id"], row["display_name"]
 
         # 4️⃣ SET SESSION
         session.permanent = True # Keep user logged in even if they close browser
@@ -270,8 +230,7 @@ def google_callback():
         display_name=display_name.split()[0].capitalize()
         session["display_name"] = display_name
         
-        cur.close()
-        # conn.close() is handled in finally block
+        # conn is returned to the pool in teardown_appcontext
 
         return redirect("/dashboard")
 
@@ -282,12 +241,6 @@ def google_callback():
         flash("An error occurred during login.")
         return redirect(url_for('login_google'))
 
-    finally:
-        # 5️⃣ PREVENT CONNECTION LEAKS
-        # Always close the connection, even if the code crashes above.
-        if conn:
-            conn.close()
-
 # ---------------- DASHBOARD ----------------
 
 def login_required(fn):
@@ -317,11 +270,9 @@ def dashboard():
     # print("RECOMMENDED INTERNSHIPS:", internships)
 
     # ---------------- UPCOMING DEADLINES (ALWAYS SHOWN) ----------------
-    deadlines = [
-        "Software Development Intern — 25 Jan",
-        "Merit Scholarship — 28 Jan",
-        "Backend Intern — 2 Feb"
-    ]
+    # saved items first, then recommendations (apply_by parsed at ingest)
+    get_saved_buffer().flush_user(user_id)
+    deadlines = InternshipRepository(get_db()).upcoming_deadlines(user_id, limit=5)
 
     return render_template(
         "dashboard.html",
@@ -332,67 +283,123 @@ def dashboard():
     )
 
 
+# ---------------- SAVED STATE OVERLAY ----------------
+# /internships is cached once for everyone; each user's saved buttons are
+# switched on afterwards from their cached saved-id set (no query per page).
+SAVE_BUTTON_RE = re.compile(
+    r'<button class="save-btn outline" data-id="(\d+)" data-type="internship">Save</button>'
+)
+SAVED_BUTTON = '<button class="save-btn outline" disabled>Saved</button>'
+
+
+def overlay_saved_state(body):
+    user_id = session.get("user_id")
+    if not user_id:
+        return body
+
+    saved_ids = get_saved_ids(user_id, "internship")
+    if not saved_ids:
+        return body
+
+    return SAVE_BUTTON_RE.sub(
+        lambda m: SAVED_BUTTON if int(m.group(1)) in saved_ids else m.group(0),
+        body,
+    )
+
+
+# (type, lowest, highest) of each range filter; the bounds are what the
+# integer / numeric(4,1) columns can hold, so a bad value never reaches SQL
+RANGE_LIMITS = {
+    "min_stipend": (int, 0, STIPEND_MAX),
+    "max_stipend": (int, 0, STIPEND_MAX),
+    "min_duration": (float, 0, DURATION_MAX_MONTHS),
+    "max_duration": (float, 0, DURATION_MAX_MONTHS),
+}
+
+
+def range_filters():
+    """
+    ?min_stipend= / ?max_stipend= (₹ per month), ?min_duration= / ?max_duration= (months).
+    Unparseable values are ignored; out-of-range ones are a 400.
+    """
+    ranges = {}
+    for name, (kind, lowest, highest) in RANGE_LIMITS.items():
+        value = request.args.get(name, type=kind)
+        if value is None:
+            continue
+        if not lowest <= value <= highest:
+            abort(400, description=f"{name} must be between {lowest} and {highest}")
+        ranges[name] = value
+    return ranges
+
+
 #View all internships
 @app.route("/internships")
+@cached_page(overlay=overlay_saved_state)
 def internships():
-    page = request.args.get("page", 1, type=int)
     PER_PAGE = 12
-    start = (page - 1) * PER_PAGE
-    end = start + PER_PAGE - 1
+    # display-only page counter; position comes from the opaque cursors
+    page = max(request.args.get("page", 1, type=int), 1)
 
     location = request.args.get("location")
     source = request.args.get("source")
+    q = (request.args.get("q") or "").strip()
+    after = decode_cursor(request.args.get("after"), RANK_ID if q else CREATED_AT_ID)
+    before = decode_cursor(request.args.get("before"))
+    ranges = range_filters()
 
-    query = supabase.table("internships").select("*")
-
-    if location:
-        query = query.ilike("location", f"%{location}%")
-
-    if source:
-        query = query.ilike("source", f"%{source}%")
-
-    query = query.order("created_at", desc=True).range(start, end)
-
-    internships = query.execute().data
-
-    # fetch saved internship ids for this user
-    user_id = session.get("user_id") # Use .get() to avoid error if not logged in
-    saved_ids = set()
-    
-    if user_id:
-        conn=get_db()
-        cur=conn.cursor()
-        cur.execute(
-            """
-            SELECT opportunity_id
-            FROM saved_opportunities
-            WHERE user_id = %s
-            AND opportunity_type = 'internship'
-            """,
-            (user_id,)
+    conn = get_db()
+    repo = InternshipRepository(conn)
+
+    if q:
+        # ranked full-text search (forward-only cursor on rank, id)
+        internships, next_cursor = repo.search(
+            q,
+            location=location,
+            source=source,
+            limit=PER_PAGE,
+            after=after,
+            ranges=ranges,
         )
-        saved_ids = set(int(row[0]) for row in cur.fetchall())
-        conn.close() # Ensure connection is closed
+        prev_cursor = None
+    else:
+        internships, next_cursor, prev_cursor = repo.list_page(
+            location=location,
+            source=source,
+            limit=PER_PAGE,
+            after=after,
+            before=None if after else before,
+            ranges=ranges,
+        )
+
+    # facet counts for the filter bar (in-memory, per catalog version)
+    facets = get_facet_index().counts(
+        location=location or None,
+        source=source or None,
+        ranges=tuple(ranges.get(name) for name in RANGE_FILTERS),
+    )
 
+    # saved buttons are filled in per user by overlay_saved_state
     return render_template(
         "internships.html",
         internships=internships,
-        saved_ids=saved_ids,
-        page=page
+        page=page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        location=location or "",
+        source=source or "",
+        q=q,
+        ranges=ranges,
+        facets=facets
     )
 
 
 @app.route("/internships/<int:internship_id>")
+@cached_page
 def internship_details(internship_id):
-    internship = (
-        supabase
-        .table("internships")
-        .select("*")
-        .eq("id", internship_id)
-        .single()
-        .execute()
-        .data
-    )
+    internship = InternshipRepository(get_db()).get(internship_id)
+    if internship is None:
+        abort(404)
 
     return render_template(
         "internship_details.html",
@@ -431,41 +438,19 @@ def profile_setup():
     # ---------- LOAD EXISTING PROFILE ----------
     
 
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+    users = UserRepository(get_db())
 
     # -------- profile --------
-    cur.execute(
-        "SELECT * FROM user_profiles WHERE user_id = %s",
-        (user_id,)
-    )
-    profile = cur.fetchone()   # dict or None
+    profile = users.get_profile(user_id)   # dict or None
 
     # -------- skills --------
-    cur.execute(
-        "SELECT skill FROM user_skills WHERE user_id = %s",
-        (user_id,)
-    )
-    skills = [r["skill"] for r in cur.fetchall()]
+    skills = users.get_skills(user_id)
 
     # -------- interests --------
-    cur.execute(
-        "SELECT interest FROM user_interests WHERE user_id = %s",
-        (user_id,)
-    )
-    interests = [r["interest"] for r in cur.fetchall()]
+    interests = users.get_interests(user_id)
 
     # -------- email --------
-    cur.execute(
-        "SELECT email FROM users WHERE id = %s",
-        (user_id,)
-    )
-    email_row = cur.fetchone()
-    email = email_row["email"] if email_row else "Error"
-    print(email)
-
-    cur.close()
-    conn.close()
+    email = users.get_email(user_id) or "Error"
 
     return render_template(
         "profile_setup.html",
@@ -477,32 +462,82 @@ def profile_setup():
 
 
 #Saved Opportunities
+# Clicks go through the per-worker write-behind buffer (utils.saved_buffer)
+# and update the cached saved-id set (utils.saved_cache) in the same call
+SAVED_TYPES = ("internship", "scholarship")
+MAX_BATCH_OPS = 500
+
+
+def _parse_saved_op(data, action):
+    """(opportunity_id, opportunity_type, action) or None if malformed."""
+    try:
+        opportunity_id = data["opportunity_id"]
+        opportunity_type = data["opportunity_type"]
+        if isinstance(opportunity_id, bool):
+            return None
+        opportunity_id = int(opportunity_id)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not 0 < opportunity_id <= BIGINT_MAX:
+        return None
+    if opportunity_type not in SAVED_TYPES or action not in ACTIONS:
+        return None
+    return opportunity_id, opportunity_type, action
+
+
+def _unknown_saves(ops):
+    """
+    Ids of internships to save that do not exist. Checked here so the
+    write-behind flush never meets them; unsaving a vanished listing is
+    still allowed (it deletes nothing).
+    """
+    ids = {op[0] for op in ops if op[1] == "internship" and op[2] == "save"}
+    if not ids:
+        return set()
+    return ids - InternshipRepository(get_db()).existing_ids(ids)
+
+
 @app.route("/save", methods=["POST"])
 @login_required
 def save_opportunity():
     user_id = session["user_id"]
-    data = request.get_json()
+    op = _parse_saved_op(request.get_json(silent=True), "save")
+    if op is None or _unknown_saves([op]):
+        return {"status": "INVALID"}, 400
 
-    opportunity_id = data["opportunity_id"]
-    opportunity_type = data["opportunity_type"]
+    record_saved_ops(user_id, [op])
 
-    conn = get_db()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO saved_opportunities (user_id, opportunity_id, opportunity_type)
-        VALUES (%s, %s, %s)
-        ON CONFLICT DO NOTHING
-        """,
-        (user_id, opportunity_id, opportunity_type)
-    )
+    return {"status": "SAVED"}, 200
 
-    conn.commit()
-    cur.close()
-    conn.close()
 
-    return {"status": "SAVED"}, 200
+# Many save/unsave toggles in one request:
+# {"operations": [{"opportunity_id": 1, "opportunity_type": "internship", "action": "save"}, ...]}
+@app.route("/saved/batch", methods=["POST"])
+@login_required
+def saved_batch():
+    user_id = session["user_id"]
+    data = request.get_json(silent=True) or {}
+    items = data.get("operations") if isinstance(data, dict) else data
+
+    if not isinstance(items, list) or not items:
+        return {"status": "INVALID", "error": "operations must be a non-empty list"}, 400
+    if len(items) > MAX_BATCH_OPS:
+        return {"status": "INVALID", "error": f"at most {MAX_BATCH_OPS} operations"}, 400
+
+    ops = []
+    for i, item in enumerate(items):
+        op = _parse_saved_op(item, (item or {}).get("action") if isinstance(item, dict) else None)
+        if op is None:
+            return {"status": "INVALID", "error": f"bad operation at index {i}"}, 400
+        ops.append(op)
+
+    unknown = _unknown_saves(ops)
+    if unknown:
+        return {"status": "INVALID", "error": f"unknown opportunity_id {min(unknown)}"}, 400
+
+    record_saved_ops(user_id, ops)
+
+    return {"status": "OK", "applied": len(ops)}, 200
 
 #saved page route
 @app.route("/saved")
@@ -510,23 +545,16 @@ def save_opportunity():
 def saved_page():
     user_id = session["user_id"]
 
-    conn = get_db()
-    cur = conn.cursor()
-
-    # Saved internships
-    cur.execute(
-        """
-        SELECT i.*
-        FROM saved_opportunities s
-        JOIN internships i ON i.id = s.opportunity_id
-        WHERE s.user_id = %s
-          AND s.opportunity_type = 'internship'
-        """,
-        (user_id,)
+    SAVED_PER_PAGE = 20
+    after = decode_cursor(request.args.get("after"))
+
+    # Saved internships (pending clicks from this worker written first)
+    get_saved_buffer().flush_user(user_id)
+    internships, next_cursor = SavedRepository(get_db()).saved_internships(
+        user_id,
+        limit=SAVED_PER_PAGE,
+        after=after,
     )
-    internships = cur.fetchall()
-    cols_i = [d[0] for d in cur.description]
-    internships = [dict(zip(cols_i, r)) for r in internships]
 
     # # Saved scholarships
     # cur.execute(
@@ -545,13 +573,12 @@ def saved_page():
 
     scholarships=[]
 
-    cur.close()
-    conn.close()
-
     return render_template(
         "saved.html",
         internships=internships,
-        scholarships=scholarships
+        scholarships=scholarships,
+        next_cursor=next_cursor,
+        is_first_page=after is None
     )
 
 #Unsave route
@@ -559,45 +586,130 @@ def saved_page():
 @login_required
 def unsave_opportunity():
     user_id = session["user_id"]
-    data = request.get_json()
-
-    opportunity_id = data["opportunity_id"]
-    opportunity_type = data["opportunity_type"]
-
-    conn = get_db()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        DELETE FROM saved_opportunities
-        WHERE user_id = %s
-          AND opportunity_id = %s
-          AND opportunity_type = %s
-        """,
-        (user_id, opportunity_id, opportunity_type)
-    )
+    op = _parse_saved_op(request.get_json(silent=True), "unsave")
+    if op is None or _unknown_saves([op]):
+        return {"status": "INVALID"}, 400
 
-    conn.commit()
-    cur.close()
-    conn.close()
+    record_saved_ops(user_id, [op])
 
     return {"status": "UNSAVED"}, 200
 
 #Route for FAQS
 @app.route("/faqs")
+@cached_page
 def faqs():
     return render_template("faqs.html")
 
 #Route for About Us
 @app.route("/about")
+@cached_page
 def about_us():
     return render_template("about_us.html")
 
 #Route for Privacy page
 @app.route("/privacy")
+@cached_page
 def privacy():
     return render_template("privacy.html")
 
+# ---------------- JSON API ----------------
+API_MAX_LIMIT = 5000
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+@app.route("/api/internships")
+def api_internships():
+    """
+    Internships as NDJSON (default) or one chunked JSON document
+    (?format=json), streamed straight from a server-side cursor.
+
+    Same location/source/after/range filters as /internships, plus ?limit= and
+    ?fields=title,organization. When a limit cuts the result short the
+    next cursor comes last: a {"next_cursor": ...} line in NDJSON, or the
+    "next_cursor" key in JSON. ETag / Last-Modified follow the catalog
+    version, so unchanged pulls cost a 304.
+    """
+    location = request.args.get("location") or None
+    source = request.args.get("source") or None
+    # a bad cursor must fail here: once streaming starts the status is sent
+    after = decode_cursor(request.args.get("after"))
+    if request.args.get("after") and after is None:
+        return {"error": "Invalid cursor"}, 400
+    ranges = range_filters()
+    limit = request.args.get("limit", type=int)
+    limit = min(limit, API_MAX_LIMIT) if limit and limit > 0 else None
+    as_json = request.args.get("format") == "json"
+
+    fields = [f.strip() for f in (request.args.get("fields") or "").split(",") if f.strip()]
+    unknown = [f for f in fields if f not in INTERNSHIP_DETAIL_COLUMNS]
+    if unknown:
+        return {"error": f"Unknown fields: {', '.join(unknown)}"}, 400
+    fields = fields or list(INTERNSHIP_DETAIL_COLUMNS)
+
+    # conditional GET before touching the table
+    version, updated_at = get_catalog_meta()
+    variant = hashlib.md5(request.query_string).hexdigest()[:12]
+    etag = f"catalog-{version}-{variant}"
+    if not is_resource_modified(request.environ, etag=etag, last_modified=updated_at):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    # id / created_at are always read so the next cursor can be built
+    columns = list(dict.fromkeys(fields + ["id", "created_at"]))
+    rows = InternshipRepository(get_db()).stream(
+        location=location,
+        source=source,
+        after=after,
+        limit=limit + 1 if limit else None,
+        columns=columns,
+        ranges=ranges,
+    )
+
+    def generate():
+        count, last = 0, None
+        if as_json:
+            yield '{"items": ['
+
+        for row in rows:
+            if limit and count == limit:
+                break
+            item = json.dumps({f: row[f] for f in fields}, default=_json_default)
+            if as_json:
+                yield ("," if count else "") + item
+            else:
+                yield item + "\n"
+            count, last = count + 1, row
+        else:
+            last = None  # ran out of rows: nothing after this page
+
+        next_cursor = encode_cursor(last["created_at"], last["id"]) if last else None
+        if as_json:
+            yield f'], "next_cursor": {json.dumps(next_cursor)}}}'
+        elif next_cursor:
+            yield json.dumps({"next_cursor": next_cursor}) + "\n"
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="application/json" if as_json else "application/x-ndjson",
+    )
+    response.set_etag(etag)
+    response.last_modified = updated_at
+    response.headers["Cache-Control"] = "public, no-cache"
+    return response
+
+
+# Pool statistics for this worker (used to size DB_POOL_* per gunicorn worker),
+# plus its saved-items write buffer (pending / written / dropped ops)
+@app.route("/health/db")
+def db_health():
+    return {**pool_stats(), "saved_buffer": get_saved_buffer().stats()}, 200
+
 # ---------------- LOGOUT ----------------
 @app.route("/logout")
 def logout():
@@ -103,15 +103,6 @@ def scrape_aicte():
 
                 title=text("h3.job-title") or ""
 
-                try:
-                    skills=extractor.extract(title) if title else []
-                except Exception as e:
-                    print("Skills ectraction failed :" ,e)
-                    skills=[]
-                    
-
-
-
                 # ✅ NEW: canonical CSV record (matches allinternships)
                 record = {
                     "title": title,
@@ -119,7 +110,7 @@ def scrape_aicte():
                     "location": text("li.location span"),
                     "duration": text("li.duration span"),
                     "stipend": text("li.stipend span", 0),
-                    "skills_final": skills,
+                    "skills_final": None,  # filled in one batch below
                     "posted_on": text("li.posted-on span"),
                     "start_date": text("li.start-date span"),
                     "type": "Internship",
@@ -170,6 +161,15 @@ def scrape_aicte():
 
         browser.close()
 
+    # skills for all cards in one batch (repeated titles extracted once)
+    try:
+        skills = extractor.extract_many([r["title"] for r in all_internships])
+    except Exception as e:
+        print("Skills extraction failed :", e)
+        skills = [[] for _ in all_internships]
+    for record, record_skills in zip(all_internships, skills):
+        record["skills_final"] = record_skills
+
     # ✅ NEW: single CSV write at the end
     save_to_csv(all_internships)
 
@@ -4,6 +4,7 @@ import pandas as pd
 import os
 import time
 from datetime import datetime,timezone
+from utils.skills.factory import get_extractor
 # from utils.insert_supabase import insert_internship_supabase
 # from utils.hashing import row_hash
 # -------------------- CONFIG --------------------
@@ -227,6 +228,13 @@ def main():
 
     df = pd.DataFrame(all_data).drop_duplicates(subset=["apply_link"])
 
+    # cards without skill tags get skills from their titles, one batch
+    untagged = df["skills_final"].map(len).eq(0)
+    if untagged.any():
+        df.loc[untagged, "skills_final"] = get_extractor("Internshala").extract_many(
+            df.loc[untagged, "title"]
+        )
+
     ensure_data_dir()
     
 
@@ -2,6 +2,7 @@ from playwright.sync_api import sync_playwright
 import pandas as pd
 from datetime import datetime
 import time
+from utils.skills.factory import get_extractor
 
 # ---------------- CONFIG ---------------- #
 URL = "https://remoteok.com"
@@ -91,6 +92,9 @@ def main():
     # Remove duplicates safely
     df.drop_duplicates(subset=["apply_link"], inplace=True)
 
+    # Skills derived from the titles, one batch
+    df["skills_final"] = get_extractor("RemoteOK").extract_many(df["title"])
+
     # Save AICTE INP file
     df.to_csv(OUTPUT_FILE, index=False)
 
@@ -100,19 +100,6 @@ def run_complex_scraper():
                         "sector": sector
                     }
 
-                    metadata={}
-
-                    if extra_data:
-                        try:
-                            metadata = json.loads(extra_data)
-                        except:
-                            metadata = {}
-
-                        skills = extractor.extract(
-                        title=title,
-                        metadata=metadata
-                        )
-
                     # ✅ NEW: Canonical CSV record (schema-aligned)
                     record = {
                         "title": title,
@@ -120,7 +107,7 @@ def run_complex_scraper():
                         "location": None,
                         "duration": duration,
                         "stipend": None,
-                        "skills_final": skills,
+                        "skills_final": None,  # filled in one batch below
                         "posted_on": None,
                         "start_date": None,
                         "type": "Internship",
@@ -170,6 +157,14 @@ def run_complex_scraper():
 
         browser.close()
 
+        # ---------------- SKILLS (one batch over all cards) ---------------- #
+        skills = extractor.extract_many(
+            [r["title"] for r in all_data],
+            [r["extra_data"] for r in all_data],
+        )
+        for record, record_skills in zip(all_data, skills):
+            record["skills_final"] = record_skills
+
         # ---------------- CSV SAVE (NEW, FINAL STEP) ---------------- #
         if all_data:
             ensure_output_dir()
@@ -1,4 +1,7 @@
 from utils.db import get_db
+from utils.batch_recommendations import refresh_user_recommendations
+from utils.cache import invalidate_user
+from utils.skills.dictionary import sync_user_skill_ids
 
 
 def upsert_profile(user_id, profile, skills, interests, email=None):
@@ -84,6 +87,9 @@ def upsert_profile(user_id, profile, skills, interests, email=None):
             (user_id, skill)
         )
 
+    # sorted dictionary ids: what the skill index matches on
+    sync_user_skill_ids(cur, user_id)
+
     # ---------- INTERESTS ----------
     cur.execute("DELETE FROM user_interests WHERE user_id = %s", (user_id,))
     for interest in interests:
@@ -94,4 +100,16 @@ def upsert_profile(user_id, profile, skills, interests, email=None):
 
     conn.commit()
     cur.close()
+
+    # ---------- PRECOMPUTED RECOMMENDATIONS ----------
+    try:
+        refresh_user_recommendations(user_id, conn)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Recommendations not refreshed for {user_id}: {e}")
+
+    # cached completeness / recommendations are stale now
+    invalidate_user(user_id)
+
     conn.close()
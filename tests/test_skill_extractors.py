@@ -0,0 +1,80 @@
+import unittest
+from utils.skills.aicte_skills import AICTEExtractor
+from utils.skills.skill_india import SkillIndiaExtractor
+from utils.skills.dictionary import canonical_skill
+from utils.skills.matcher import KeywordMatcher
+
+# Titles from data/, with what the old substring matcher (`keyword in
+# text`) got right and must still be found ...
+AICTE_FOUND = [
+    ("ACCOUNTS ASSISTANT(INTERN)", "Accounting"),
+    ("PRACTICAL ACCOUNTANCY WITH TAXATION", "Accounting"),
+    ("HUMAN RESOURCES MANAGEMENT INTERNSHIP", "Recruitment"),
+    ("GRAPHICS & JOB CARD DESIGN INTERN", "Graphic Design"),
+    ("BUSINESS / MARKET RESEARCHER", "Market Research"),
+    ("MACHINE LEARNING INTERN", "Machine Learning"),
+]
+SKILL_INDIA_FOUND = [
+    ("Advanced Taxation (ATX) Internship", "Taxation"),
+    ("Advanced Portuguese Copywriting, Journalism Internship", "Writing"),
+    ("Accounts Executive Internship", "Accounting"),
+]
+# ... and what it matched inside other words, which must stay gone
+AICTE_NOT_FOUND = [
+    ("JAVASCRIPT DEVELOPMENT INTERN", "Java"),
+    ("SALESFORCE INTERNSHIP - INTERNCERTIFY", "Sales"),
+    ("OPTIMIZING PRODUCTION THROUGH ADVANCED DATA ANALYTICS", "Recruitment"),
+    ("MAINTENANCE ENGINEER", "Machine Learning"),
+]
+SKILL_INDIA_NOT_FOUND = [
+    ("HR Generalist Internship", "R"),
+    ("Salesforce Developer Internship (Beginner Level)", "R"),
+    ("Technical Writing Internship Program", "Machine Learning"),
+]
+
+
+class TitleToSkillsTest(unittest.TestCase):
+
+    def check(self, extractor, found, not_found):
+        for title, skill in found:
+            with self.subTest(title=title):
+                self.assertIn(skill, extractor.extract(title))
+        for title, skill in not_found:
+            with self.subTest(title=title):
+                self.assertNotIn(skill, extractor.extract(title))
+
+    def test_aicte(self):
+        self.check(AICTEExtractor(), AICTE_FOUND, AICTE_NOT_FOUND)
+
+    def test_skill_india(self):
+        self.check(SkillIndiaExtractor(), SKILL_INDIA_FOUND, SKILL_INDIA_NOT_FOUND)
+
+    def test_max_skills(self):
+        skills = AICTEExtractor().extract("full stack web development with python, java and sql")
+        self.assertEqual(len(skills), AICTEExtractor.MAX_SKILLS)
+
+
+class KeywordMatcherTest(unittest.TestCase):
+
+    def test_inflected_hits(self):
+        matcher = KeywordMatcher(["account", "robot", "human resource"])
+        self.assertEqual(matcher.find("accountant for robotics and human resources"), [0, 1, 2])
+
+    def test_short_keywords_stay_whole_words(self):
+        matcher = KeywordMatcher(["go", "ai", "java"])
+        self.assertEqual(matcher.find("goes maintain aids javascript"), [])
+        self.assertEqual(matcher.find("go / ai / java"), [0, 1, 2])
+
+
+class CanonicalSkillTest(unittest.TestCase):
+
+    def test_parenthesized_qualifiers_stay_apart(self):
+        self.assertEqual(canonical_skill("English Proficiency (Written)"), "English Proficiency (Written)")
+        self.assertEqual(canonical_skill("English Proficiency (Spoken)"), "English Proficiency (Spoken)")
+
+    def test_parenthesized_abbreviation(self):
+        self.assertEqual(canonical_skill("Natural Language Processing (NLP)"), "Natural Language Processing")
+
+
+if __name__ == "__main__":
+    unittest.main()
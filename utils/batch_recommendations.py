@@ -0,0 +1,143 @@
+import time
+from psycopg2.extras import execute_values
+from utils.db import get_db
+from utils.catalog import get_catalog_version
+from utils.recommendation_utils import rank_internships, RECOMMENDATIONS_TOP_N
+from validators.profile_validator import MIN_SKILLS
+
+CHUNK_SIZE = 500
+
+# -------------------------------------------------
+# Users with a complete profile (same rule as is_profile_complete),
+# paged by user_id so memory stays bounded by CHUNK_SIZE.
+# -------------------------------------------------
+USERS_SQL = """
+    SELECT
+        p.user_id,
+        p.location,
+        ARRAY(SELECT skill FROM user_skills s WHERE s.user_id = p.user_id),
+        ARRAY(SELECT interest FROM user_interests t WHERE t.user_id = p.user_id),
+        p.skill_ids
+    FROM user_profiles p
+    WHERE {after}
+      (SELECT COUNT(*) FROM user_skills s WHERE s.user_id = p.user_id) >= %(min_skills)s
+    ORDER BY p.user_id
+    LIMIT %(limit)s
+"""
+
+
+def _fetch_users(cur, after, limit):
+    sql = USERS_SQL.format(after="p.user_id > %(after)s AND" if after is not None else "")
+    cur.execute(sql, {"after": after, "min_skills": MIN_SKILLS, "limit": limit})
+    return cur.fetchall()
+
+
+def _write(cur, users, ranked, version):
+    user_ids = [u[0] for u in users]
+
+    cur.execute(
+        "DELETE FROM user_recommendations WHERE user_id IN %s",
+        (tuple(user_ids),)
+    )
+
+    rows = [
+        (user[0], rank, rec["id"], rec["match_score"], rec.get("score"), version)
+        for user, recs in zip(users, ranked)
+        for rank, rec in enumerate(recs, 1)
+    ]
+    if rows:
+        execute_values(
+            cur,
+            """
+            INSERT INTO user_recommendations
+                (user_id, rank, internship_id, match_score, score, catalog_version)
+            VALUES %s
+            """,
+            rows,
+            page_size=1000,
+        )
+    return len(rows)
+
+
+def materialize_recommendations(conn, chunk_size=CHUNK_SIZE, top_n=RECOMMENDATIONS_TOP_N):
+    """
+    Recompute the top-N internships for every user with a complete profile
+    and store them in user_recommendations, one chunk (and commit) at a time.
+    """
+    print("\n🧮 Materializing recommendations")
+    start = time.perf_counter()
+    version = get_catalog_version()
+
+    cur = conn.cursor()
+    after = None
+    total_users = 0
+    total_rows = 0
+
+    while True:
+        chunk_start = time.perf_counter()
+        users = _fetch_users(cur, after, chunk_size)
+        if not users:
+            break
+
+        ranked = rank_internships(
+            [(u[2] or [], u[3] or [], u[1], u[4] or []) for u in users],
+            top_n,
+        )
+        total_rows += _write(cur, users, ranked, version)
+        conn.commit()
+
+        total_users += len(users)
+        after = users[-1][0]
+
+        elapsed = time.perf_counter() - chunk_start
+        print(f"   {total_users} users ({len(users) / max(elapsed, 1e-9):.0f} users/s)")
+
+    cur.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ {total_users} users, {total_rows} rows in {elapsed:.2f}s "
+        f"({total_users / max(elapsed, 1e-9):.0f} users/s)"
+    )
+    return total_users
+
+
+def refresh_user_recommendations(user_id, conn=None, top_n=RECOMMENDATIONS_TOP_N):
+    """Recompute one user's rows (after a profile edit). The caller commits."""
+    conn = conn or get_db()
+    cur = conn.cursor()
+
+    cur.execute(
+        """
+        SELECT
+            p.location,
+            ARRAY(SELECT skill FROM user_skills s WHERE s.user_id = p.user_id),
+            ARRAY(SELECT interest FROM user_interests t WHERE t.user_id = p.user_id),
+            p.skill_ids
+        FROM user_profiles p
+        WHERE p.user_id = %s
+        """,
+        (user_id,)
+    )
+    row = cur.fetchone()
+
+    if not row or len(row[1] or []) < MIN_SKILLS:
+        cur.execute("DELETE FROM user_recommendations WHERE user_id = %s", (user_id,))
+        cur.close()
+        return 0
+
+    location, skills, interests, skill_ids = row
+    ranked = rank_internships([(skills or [], interests or [], location, skill_ids or [])], top_n)
+    written = _write(cur, [(user_id,)], ranked, get_catalog_version())
+    cur.close()
+    return written
+
+
+def main():
+    conn = get_db()
+    materialize_recommendations(conn)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
+import io
 import os
-import json
+import time
 import pandas as pd
-from psycopg2.extras import Json
 import psycopg2
 from dotenv import load_dotenv
+from utils.schema import ensure_schema
+from utils.normalize import add_normalized_columns, NORMALIZED_COLUMNS
+from utils.hashing import frame_hash
+from utils.skills.parsing import parse_skill_list
+from utils.skills.dictionary import canonicalize, skill_key, sync_seed, sync_user_skill_ids
+from utils.catalog import bump_catalog_version
+from utils.batch_recommendations import materialize_recommendations
+from utils.cache import invalidate_catalog
 
 # -------------------------------------------------
 # Load environment variables
@@ -42,95 +50,326 @@ def get_csv_files():
     return files
 
 
-def clean_dataframe(df):
-    # NaN → None (important for psycopg2)
-    df = df.where(pd.notnull(df), None)
+# Every column the uploader writes, in COPY order. Sources without a
+# column (e.g. RemoteOK has no stipend) get NULL.
+UPLOAD_COLUMNS = (
+    "title",
+    "organization",
+    "location",
+    "duration",
+    "stipend",
+    "skills_final",
+    "posted_on",
+    "start_date",
+    "type",
+    "source",
+    "apply_link",
+    "scraped_at",
+    "content_hash",
+    "extra_data",
+) + NORMALIZED_COLUMNS
 
-    # extra_data must be JSON / dict
-    if "extra_data" in df.columns:
-        df["extra_data"] = df["extra_data"].apply(
-            lambda x: json.loads(x) if isinstance(x, str) else None
-        )
+CONFLICT_KEY = ("title", "organization")
+
+# Rows read, normalized and COPY-ed per round; bounds the uploader's memory
+CHUNK_ROWS = int(os.getenv("UPLOAD_CHUNK_ROWS", "5000"))
+
+# What upload_csv reports; any of CHANGE_COUNTS non-zero means a new catalog
+UPLOAD_COUNTS = (
+    "inserted", "updated", "unchanged",
+    "skills_added", "skills_removed", "new_skills", "skill_ids_updated",
+)
+CHANGE_COUNTS = ("inserted", "updated", "skills_added", "skills_removed", "skill_ids_updated")
+
+STAGE_TABLE = "internships_stage"
+SKILLS_STAGE_TABLE = "internship_skills_stage"
 
+
+def prepare_chunk(df, first_line):
+    """Normalize one CSV chunk and lay it out as UPLOAD_COLUMNS (+ _line)."""
+    # scrapers leave content_hash empty; fingerprint here, for every source
+    df["content_hash"] = frame_hash(df)
+    df = add_normalized_columns(df)
+    df = df.reindex(columns=list(UPLOAD_COLUMNS))
+    # later rows win when a CSV repeats (title, organization)
+    df["_line"] = range(first_line, first_line + len(df))
     return df
 
 
+def explode_skills(df):
+    """
+    (_line, skill, key, alias) rows from a prepared chunk's skills_final
+    repr strings: skill is the canonical name (utils.skills.dictionary,
+    resolved once per distinct raw tag), alias the raw tag's key.
+    """
+    raw = df["skills_final"].map(parse_skill_list).explode().dropna()
+    skills = canonicalize(raw)
+    exploded = pd.DataFrame({
+        "_line": df["_line"].loc[skills.index],
+        "skill": skills,
+        "key": skills.map(skill_key),
+        "alias": raw.map(skill_key),
+    })
+    return exploded.drop_duplicates(["_line", "key"])
+
+
+def create_stage(cur):
+    """Session-local copies of the upload columns, no constraints or indexes."""
+    cur.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} AS
+        SELECT {", ".join(UPLOAD_COLUMNS)}, 0::bigint AS _line
+        FROM {TABLE_NAME}
+        WITH NO DATA
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS {SKILLS_STAGE_TABLE} (
+            _line bigint NOT NULL,
+            skill text NOT NULL,
+            key   text NOT NULL,
+            alias text NOT NULL
+        )
+        """
+    )
+    cur.execute(f"TRUNCATE {STAGE_TABLE}, {SKILLS_STAGE_TABLE}")
+
+
+def copy_chunk(cur, df, table=STAGE_TABLE):
+    buf = io.StringIO()
+    # minimal quoting: NaN / None become unquoted empty fields → NULL
+    df.to_csv(buf, index=False, header=False)
+    buf.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)",
+        buf,
+    )
+
+
+def merge_stage(cur):
+    """
+    One set-based upsert from the staging table. Existing rows are only
+    rewritten when their content_hash changed, so an unchanged listing
+    costs no WAL, index churn or dead tuple.
+    Returns {"inserted", "updated", "unchanged"}.
+    """
+    columns = ", ".join(UPLOAD_COLUMNS)
+    updates = ",\n                ".join(
+        f"{c} = EXCLUDED.{c}" for c in UPLOAD_COLUMNS if c not in CONFLICT_KEY
+    )
+    cur.execute(
+        f"""
+        WITH merged AS (
+            INSERT INTO {TABLE_NAME} AS t ({columns})
+            SELECT DISTINCT ON (title, organization) {columns}
+            FROM {STAGE_TABLE}
+            ORDER BY title, organization, _line DESC
+            ON CONFLICT (title, organization)
+            DO UPDATE SET
+                {updates},
+                updated_at = now()
+            WHERE t.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT
+            (SELECT count(*) FROM (SELECT DISTINCT title, organization FROM {STAGE_TABLE}) k),
+            count(*) FILTER (WHERE inserted),
+            count(*) FILTER (WHERE NOT inserted)
+        FROM merged
+        """
+    )
+    staged, inserted, updated = cur.fetchone()
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": staged - inserted - updated,
+    }
+
+
+# The internships in this file (by id) and the staged line that wins for each
+TARGETS_CTE = f"""
+        latest AS (
+            SELECT DISTINCT ON (title, organization) title, organization, _line
+            FROM {STAGE_TABLE}
+            ORDER BY title, organization, _line DESC
+        ),
+        targets AS (
+            SELECT i.id, l._line
+            FROM latest l
+            JOIN {TABLE_NAME} i USING (title, organization)
+        )"""
+
+
+def sync_skills(cur):
+    """
+    Bring internship_skills in line with the staged skills_final of every
+    internship in this file. Only the difference is written: one DELETE for
+    skills that disappeared and one INSERT for new ones, in one statement;
+    internships whose skills changed get a new updated_at. Returns (added, removed).
+    """
+    cur.execute(
+        f"""
+        WITH {TARGETS_CTE},
+        wanted AS (
+            SELECT DISTINCT t.id AS internship_id, s.skill
+            FROM targets t
+            JOIN {SKILLS_STAGE_TABLE} s ON s._line = t._line
+        ),
+        removed AS (
+            DELETE FROM internship_skills k
+            USING targets t
+            WHERE k.internship_id = t.id
+              AND NOT EXISTS (
+                  SELECT 1 FROM wanted w
+                  WHERE w.internship_id = k.internship_id AND w.skill = k.skill
+              )
+            RETURNING k.internship_id
+        ),
+        added AS (
+            INSERT INTO internship_skills (internship_id, skill)
+            SELECT w.internship_id, w.skill
+            FROM wanted w
+            WHERE NOT EXISTS (
+                SELECT 1 FROM internship_skills k
+                WHERE k.internship_id = w.internship_id AND k.skill = w.skill
+            )
+            RETURNING internship_id
+        ),
+        touched AS (
+            UPDATE {TABLE_NAME}
+            SET updated_at = now()
+            WHERE id IN (SELECT internship_id FROM added
+                         UNION SELECT internship_id FROM removed)
+        )
+        SELECT (SELECT count(*) FROM added), (SELECT count(*) FROM removed)
+        """
+    )
+    return cur.fetchone()
+
+
+def sync_skill_ids(cur):
+    """
+    Add staged skills the dictionary does not know yet and record raw tags
+    that were canonicalized to another name as derived aliases (rewritten
+    when the canonicalizer now says otherwise; seed aliases stay), then set
+    internships.skill_ids (sorted dictionary ids) for every internship in
+    this file whose array changed, with a new updated_at so the skill
+    index re-reads it. Returns (new_skills, updated).
+    """
+    # a tag that canonicalizes to itself now no longer needs its old alias
+    cur.execute(
+        f"""
+        DELETE FROM skill_aliases a
+        USING {SKILLS_STAGE_TABLE} s
+        WHERE a.derived
+          AND a.alias = s.key
+          AND s.alias = s.key
+        """
+    )
+
+    cur.execute(
+        f"""
+        INSERT INTO skills (name, key)
+        SELECT DISTINCT ON (s.key) s.skill, s.key
+        FROM {SKILLS_STAGE_TABLE} s
+        WHERE NOT EXISTS (SELECT 1 FROM skill_aliases a WHERE a.alias = s.key)
+        ORDER BY s.key, s.skill
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+    new_skills = cur.rowcount
+
+    cur.execute(
+        f"""
+        INSERT INTO skill_aliases (alias, skill_id, derived)
+        SELECT DISTINCT ON (s.alias) s.alias, d.id, true
+        FROM {SKILLS_STAGE_TABLE} s
+        JOIN skills d ON d.key = s.key
+        WHERE s.alias <> s.key
+        ORDER BY s.alias, d.id
+        ON CONFLICT (alias) DO UPDATE
+        SET skill_id = EXCLUDED.skill_id
+        WHERE skill_aliases.derived
+          AND skill_aliases.skill_id <> EXCLUDED.skill_id
+        """
+    )
+
+    cur.execute(
+        f"""
+        WITH {TARGETS_CTE},
+        resolved AS (
+            SELECT s._line, coalesce(d.id, a.skill_id) AS skill_id
+            FROM {SKILLS_STAGE_TABLE} s
+            LEFT JOIN skills d ON d.key = s.key
+            LEFT JOIN skill_aliases a ON a.alias = s.key
+        ),
+        wanted AS (
+            SELECT t.id,
+                   coalesce(
+                       array_agg(DISTINCT r.skill_id ORDER BY r.skill_id)
+                           FILTER (WHERE r.skill_id IS NOT NULL),
+                       '{{}}'
+                   ) AS skill_ids
+            FROM targets t
+            LEFT JOIN resolved r ON r._line = t._line
+            GROUP BY t.id
+        )
+        UPDATE {TABLE_NAME} i
+        SET skill_ids = w.skill_ids,
+            updated_at = now()
+        FROM wanted w
+        WHERE i.id = w.id
+          AND i.skill_ids IS DISTINCT FROM w.skill_ids
+        """
+    )
+    return new_skills, cur.rowcount
+
+
 # -------------------------------------------------
 # Main uploader
 # -------------------------------------------------
 def upload_csv(conn, csv_path):
+    """
+    Stream one CSV into the database: chunks of CHUNK_ROWS are normalized
+    and COPY-ed into a temp staging table, then merged with a single
+    INSERT ... SELECT ... ON CONFLICT, after which internship_skills is
+    synced from skills_final. One transaction per file.
+    """
     print(f"\n📤 Uploading: {csv_path}")
+    start = time.perf_counter()
 
-    df = pd.read_csv(csv_path)
-    df = clean_dataframe(df)
+    cur = conn.cursor()
+    create_stage(cur)
 
-    records = df.to_dict(orient="records")
+    total = 0
+    for chunk in pd.read_csv(csv_path, chunksize=CHUNK_ROWS):
+        chunk = prepare_chunk(chunk, total)
+        copy_chunk(cur, chunk)
+        copy_chunk(cur, explode_skills(chunk), SKILLS_STAGE_TABLE)
+        total += len(chunk)
 
-    if not records:
+    if not total:
         print("⚠️ Empty CSV, skipping")
-        return
-
-    cur = conn.cursor()
-
-    for row in records:
-        if row.get("extra_data") is not None:
-            row["extra_data"] = Json(row["extra_data"])
-        cur.execute(
-            f"""
-            INSERT INTO {TABLE_NAME} (
-                title,
-                organization,
-                location,
-                duration,
-                stipend,
-                skills_final,
-                posted_on,
-                start_date,
-                type,
-                source,
-                apply_link,
-                scraped_at,
-                content_hash,
-                extra_data
-            )
-            VALUES (
-                %(title)s,
-                %(organization)s,
-                %(location)s,
-                %(duration)s,
-                %(stipend)s,
-                %(skills_final)s,
-                %(posted_on)s,
-                %(start_date)s,
-                %(type)s,
-                %(source)s,
-                %(apply_link)s,
-                %(scraped_at)s,
-                %(content_hash)s,
-                %(extra_data)s
-            )
-            ON CONFLICT (title, organization)
-            DO UPDATE SET
-                location      = EXCLUDED.location,
-                duration      = EXCLUDED.duration,
-                stipend       = EXCLUDED.stipend,
-                skills_final  = EXCLUDED.skills_final,
-                posted_on     = EXCLUDED.posted_on,
-                start_date    = EXCLUDED.start_date,
-                type          = EXCLUDED.type,
-                source        = EXCLUDED.source,
-                apply_link    = EXCLUDED.apply_link,
-                scraped_at    = EXCLUDED.scraped_at,
-                content_hash  = EXCLUDED.content_hash,
-                extra_data    = EXCLUDED.extra_data;
-            """,
-            row,
-        )
+        conn.rollback()
+        cur.close()
+        return dict.fromkeys(UPLOAD_COUNTS, 0)
 
+    counts = merge_stage(cur)
+    counts["skills_added"], counts["skills_removed"] = sync_skills(cur)
+    counts["new_skills"], counts["skill_ids_updated"] = sync_skill_ids(cur)
     conn.commit()
     cur.close()
 
-    print(f"✅ Uploaded {len(records)} records from {os.path.basename(csv_path)}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ {os.path.basename(csv_path)}: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged, "
+        f"skills +{counts['skills_added']}/-{counts['skills_removed']}, "
+        f"{counts['new_skills']} new in dictionary "
+        f"({total} CSV rows in {elapsed:.2f}s, {total / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+    return counts
 
 
 # -------------------------------------------------
@@ -144,10 +383,44 @@ def main():
         return
 
     conn = psycopg2.connect(DATABASE_URL, sslmode="require")
+    ensure_schema(conn)
+    cur = conn.cursor()
+    sync_seed(cur)
+    conn.commit()
+    cur.close()
 
+    totals = dict.fromkeys(UPLOAD_COUNTS, 0)
     for csv_file in csv_files:
-        upload_csv(conn, csv_file)
+        for key, value in upload_csv(conn, csv_file).items():
+            totals[key] += value
+
+    print(
+        f"\n📊 {totals['inserted']} inserted, {totals['updated']} updated, "
+        f"{totals['unchanged']} unchanged, skills +{totals['skills_added']}/-{totals['skills_removed']}"
+    )
+
+    # new skills / aliases can give users' profile skills an id they lacked
+    cur = conn.cursor()
+    users_updated = sync_user_skill_ids(cur)
+    conn.commit()
+    cur.close()
+    if users_updated:
+        print(f"👤 Skill ids updated for {users_updated} profiles")
+
+    if not users_updated and not any(totals[k] for k in CHANGE_COUNTS):
+        # same catalog: keep the version, caches and recommendations as they are
+        conn.close()
+        print("\n🎉 Bulk upload completed, catalog unchanged")
+        return
+
+    # new catalog version → web workers refresh their skill index
+    version = bump_catalog_version(conn)
+    conn.commit()
+    print(f"🔖 Catalog version is now {version}")
 
+    # precompute dashboard recommendations against the new catalog
+    materialize_recommendations(conn)
+    invalidate_catalog()
     conn.close()
 
     print("\n🎉 Bulk upload completed for ALL CSV files")
@@ -0,0 +1,227 @@
+import os
+import pickle
+from fnmatch import fnmatchcase
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # optional: only needed for CACHE_BACKEND=redis
+    redis = None
+
+# "memory" → per-worker LRU dict (default)
+# "redis"  → any Redis-compatible server at CACHE_URL, shared by workers
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "600"))
+# Per-user entries have to go on every worker when the profile changes,
+# which invalidate_user only manages through a shared backend. The memory
+# backend caches them just when the app runs as one process (flask run,
+# a single gunicorn worker) and this is set to true.
+CACHE_USER_LOCAL = os.getenv("CACHE_USER_LOCAL", "false").lower() == "true"
+
+_MISSING = object()
+
+
+class MemoryCache:
+    """Thread-safe LRU with per-entry TTL."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, default_ttl=CACHE_DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()      # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counter(self, key, initial, ttl=None):
+        """Integer at key, set to initial first if missing."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                entry = (time.monotonic() + (ttl or self.default_ttl), initial)
+                self._data[key] = entry
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def incr(self, key, initial, ttl=None):
+        """Add one to the integer at key (initial if missing); returns the new value."""
+        with self._lock:
+            entry = self._data.get(key)
+            value = initial if entry is None or entry[0] < time.monotonic() else entry[1]
+            self._data[key] = (time.monotonic() + (ttl or self.default_ttl), value + 1)
+            self._data.move_to_end(key)
+            return value + 1
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def delete_matching(self, pattern):
+        with self._lock:
+            for key in [k for k in self._data if fnmatchcase(k, pattern)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class RedisCache:
+    """
+    Same interface on a Redis-compatible server. TTLs are enforced by the
+    server; LRU eviction comes from its maxmemory-policy (allkeys-lru).
+    """
+
+    def __init__(self, url=CACHE_URL, default_ttl=CACHE_DEFAULT_TTL, namespace="smartintern:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis needs the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        raw = self.client.get(self.namespace + key)
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        ttl_ms = int((ttl or self.default_ttl) * 1000)
+        self.client.set(self.namespace + key, pickle.dumps(value), px=ttl_ms)
+
+    def delete(self, key):
+        self.client.delete(self.namespace + key)
+
+    # counters are plain Redis integers (INCR), not pickles
+    def counter(self, key, initial, ttl=None):
+        ttl_ms = int((ttl or self.default_ttl) * 1000)
+        pipe = self.client.pipeline()
+        pipe.set(self.namespace + key, initial, px=ttl_ms, nx=True)
+        pipe.get(self.namespace + key)
+        return int(pipe.execute()[1])
+
+    def incr(self, key, initial, ttl=None):
+        ttl_ms = int((ttl or self.default_ttl) * 1000)
+        pipe = self.client.pipeline()
+        pipe.set(self.namespace + key, initial, px=ttl_ms, nx=True)
+        pipe.incr(self.namespace + key)
+        pipe.pexpire(self.namespace + key, ttl_ms)
+        return pipe.execute()[1]
+
+    def delete_prefix(self, prefix):
+        self.delete_matching(prefix + "*")
+
+    def delete_matching(self, pattern):
+        keys = list(self.client.scan_iter(match=self.namespace + pattern, count=500))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start:start + 500])
+
+    def clear(self):
+        self.delete_prefix("")
+
+    def stats(self):
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+# ---------------- PER-PROCESS CACHE ----------------
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RedisCache() if CACHE_BACKEND == "redis" else MemoryCache()
+    return _cache
+
+
+def cached(key, compute, ttl=None):
+    """Return the cached value for key, computing and storing it on a miss."""
+    cache = get_cache()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, ttl)
+    return value
+
+
+def user_cache_enabled():
+    return CACHE_BACKEND == "redis" or CACHE_USER_LOCAL
+
+
+def cached_user(user_id, name, compute, ttl=None):
+    """
+    cached() for a value derived from one user's profile, stored under
+    user_cache_prefix so invalidate_user drops it. Computed every time
+    where that invalidation would not reach the other workers.
+    """
+    if not user_cache_enabled():
+        return compute()
+    return cached(user_cache_prefix(user_id) + name, compute, ttl)
+
+
+# ---------------- INVALIDATION ----------------
+def user_cache_prefix(user_id):
+    return f"user:{user_id}:"
+
+
+def invalidate_user(user_id):
+    """Profile edited: drop everything derived from this user's profile."""
+    get_cache().delete_prefix(user_cache_prefix(user_id))
+
+
+def invalidate_catalog():
+    """
+    Catalog uploaded. Every catalog-derived key (rendered pages,
+    recommendations) carries the catalog version, so workers stop reading
+    old entries as soon as they see the new version, whatever the backend.
+    This only frees those entries early where the uploader can reach them,
+    i.e. in a shared backend; profile-only entries are kept.
+    """
+    cache = get_cache()
+    cache.delete_prefix("page:")
+    cache.delete_matching(user_cache_prefix("*") + "recs:*")
@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+from utils.db import get_db
+
+# How long a worker trusts its cached catalog version before asking again.
+CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", "5"))
+
+_cached = None          # (fetched_at, version, updated_at)
+_lock = threading.Lock()
+
+
+def _fetch():
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT version, updated_at FROM catalog_meta WHERE id = 1")
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    return row if row else (0, None)
+
+
+def get_catalog_meta():
+    """
+    (version, updated_at) of the internships catalog.
+
+    The version is bumped by the uploader after every upload, so anything
+    derived from the catalog (indexes, caches, facets) can be keyed on it.
+    """
+    global _cached
+    now = time.monotonic()
+    cached = _cached
+    if cached is None or now - cached[0] > CATALOG_VERSION_TTL:
+        with _lock:
+            if _cached is None or now - _cached[0] > CATALOG_VERSION_TTL:
+                version, updated_at = _fetch()
+                _cached = (time.monotonic(), version, updated_at)
+            cached = _cached
+    return cached[1], cached[2]
+
+
+def get_catalog_version():
+    return get_catalog_meta()[0]
+
+
+def bump_catalog_version(conn):
+    """Mark the catalog as changed. The caller commits."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE catalog_meta
+        SET version = version + 1,
+            updated_at = now()
+        WHERE id = 1
+        RETURNING version
+        """
+    )
+    version = cur.fetchone()[0]
+    cur.close()
+    return version
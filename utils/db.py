@@ -1,10 +1,32 @@
 import os
+import threading
+import time
 import psycopg2
+import psycopg2.extensions
 from dotenv import load_dotenv
+from flask import g, has_app_context
 
 load_dotenv()
 
-def get_db():
+# ---------------- POOL CONFIG ----------------
+# Sizes are per process: with gunicorn, max_connections used by the app is
+# roughly workers * DB_POOL_MAX (plus the uploader / batch jobs).
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))          # wait for a free conn
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))  # reap idle conns
+DB_POOL_HEALTHCHECK_AFTER = float(os.getenv("DB_POOL_HEALTHCHECK_AFTER", "30"))
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def _connect():
+    # CI / the uploader only get DATABASE_URL; the web app uses DB_* vars
+    if not os.getenv("DB_HOST") and os.getenv("DATABASE_URL"):
+        return psycopg2.connect(os.getenv("DATABASE_URL"))
+
     return psycopg2.connect(
         host=os.getenv("DB_HOST"),
         dbname=os.getenv("DB_NAME"),
@@ -12,3 +34,284 @@ def get_db():
         password=os.getenv("DB_PASSWORD"),
         port=os.getenv("DB_PORT")
     )
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a psycopg2 connection handed out by the pool.
+
+    Behaves like the raw connection (cursor, commit, rollback, ...) but
+    close() gives it back to the pool instead of dropping the session.
+    Request-scoped connections ignore close(); they are released once in
+    teardown_appcontext.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self.last_used = time.monotonic()
+        self.request_scoped = False
+        self.checked_out = False
+        self.prepared = set()   # server-side prepared statement names
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def raw(self):
+        return self._conn
+
+    def close(self):
+        if self.request_scoped or not self.checked_out:
+            return
+        self._pool.putconn(self)
+
+
+class ConnectionPool:
+    """
+    Thread-safe Postgres connection pool.
+
+    - keeps between minconn and maxconn sessions open
+    - pings connections that sat idle longer than healthcheck_after
+    - closes idle connections above minconn after idle_timeout
+    - blocks up to `timeout` seconds when every connection is busy
+    """
+
+    def __init__(self, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+                 timeout=DB_POOL_TIMEOUT, idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                 healthcheck_after=DB_POOL_HEALTHCHECK_AFTER, connect=_connect):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("invalid pool size")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.healthcheck_after = healthcheck_after
+        self._connect = connect
+
+        self._lock = threading.Condition()
+        self._idle = []        # LIFO stack of PooledConnection
+        self._size = 0         # open connections (idle + in use)
+        self._closed = False
+
+        self._stats = {
+            "connections_created": 0,
+            "connections_reaped": 0,
+            "connections_discarded": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+        }
+
+        for _ in range(minconn):
+            self._idle.append(self._open())
+
+    # ---------- internals ----------
+    # _open / _reap expect the lock held. Network I/O in getconn (connect,
+    # health check) runs without it, so one slow server round trip never
+    # stalls the other request threads.
+    def _open(self):
+        conn = PooledConnection(self, self._connect())
+        self._size += 1
+        self._stats["connections_created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._size -= 1
+            self._stats["connections_discarded"] += 1
+            self._lock.notify()
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+
+    def _reap(self):
+        now = time.monotonic()
+        keep = []
+        # oldest first, so the most recently used ones survive
+        for conn in self._idle:
+            if (self._size > self.minconn
+                    and now - conn.last_used > self.idle_timeout):
+                self._size -= 1
+                self._stats["connections_reaped"] += 1
+                try:
+                    conn.raw.close()
+                except Exception:
+                    pass
+            else:
+                keep.append(conn)
+        self._idle = keep
+
+    def _is_healthy(self, conn):
+        if conn.raw.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.healthcheck_after:
+            return True
+        try:
+            cur = conn.raw.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.raw.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    # ---------- public API ----------
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            conn = None
+            reserved = False
+
+            # under the lock: take an idle connection or reserve a slot
+            with self._lock:
+                if self._closed:
+                    raise PoolTimeout("pool is closed")
+
+                self._reap()
+                if self._idle:
+                    conn = self._idle.pop()
+                elif self._size < self.maxconn:
+                    self._size += 1
+                    reserved = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"no free connection after {self.timeout}s "
+                            f"(max {self.maxconn})"
+                        )
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._lock.wait(remaining)
+                    continue
+
+            # outside the lock: connect / ping
+            if reserved:
+                try:
+                    conn = PooledConnection(self, self._connect())
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+            elif not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                if reserved:
+                    self._stats["connections_created"] += 1
+                if waited:
+                    self._stats["wait_time"] += time.monotonic() - start
+                conn.checked_out = True
+                conn.request_scoped = False
+                self._stats["checkouts"] += 1
+                return conn
+
+    def putconn(self, conn):
+        with self._lock:
+            if not conn.checked_out:
+                return
+            conn.checked_out = False
+            conn.request_scoped = False
+
+            if self._closed or conn.raw.closed:
+                self._discard(conn)
+                return
+
+            # never hand out a connection with an open / failed transaction
+            status = conn.raw.get_transaction_status()
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.raw.rollback()
+                except psycopg2.Error:
+                    self._discard(conn)
+                    return
+
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+            self._reap()
+            self._lock.notify()
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            for conn in self._idle:
+                try:
+                    conn.raw.close()
+                except Exception:
+                    pass
+            self._size -= len(self._idle)
+            self._idle = []
+            self._lock.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "min": self.minconn,
+                "max": self.maxconn,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+            }
+
+
+# ---------------- PER-PROCESS POOL ----------------
+# gunicorn forks workers after import, so the pool is created lazily and
+# re-created if we find ourselves in a new process.
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool()
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+def get_db():
+    """
+    Inside a Flask request: one pooled connection per request, shared by
+    every helper that calls get_db() and released in teardown.
+    Outside a request (scripts, threads): a pooled connection that goes
+    back to the pool on conn.close().
+    """
+    if has_app_context():
+        conn = g.get("_db_conn")
+        if conn is None:
+            conn = get_pool().getconn()
+            conn.request_scoped = True
+            g._db_conn = conn
+        return conn
+
+    return get_pool().getconn()
+
+
+def close_db(exc=None):
+    conn = g.pop("_db_conn", None)
+    if conn is not None:
+        get_pool().putconn(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,202 @@
+import threading
+from functools import lru_cache
+from utils.db import get_db
+from utils.catalog import get_catalog_version
+
+MAX_LOCATION_FACETS = 10
+
+FACETS = ("source", "location", "duration", "stipend")
+
+
+# ---------------- BUCKETING ----------------
+def location_bucket(location):
+    """
+    'Pan India,' → 'Pan India', 'Mumbai, Pune' → 'Mumbai'. The bucket is
+    a substring of the raw value, so it round-trips through ?location=.
+    """
+    first = " ".join((location or "").split(",")[0].split())
+    return first.title() if first else "Not specified"
+
+
+def duration_bucket(months):
+    """From the duration_months column (utils.normalize)."""
+    if months is None:
+        return "Not specified"
+    if months <= 1:
+        return "Up to 1 month"
+    if months <= 3:
+        return "1-3 months"
+    if months <= 6:
+        return "3-6 months"
+    return "6+ months"
+
+
+def stipend_bucket(stipend_max, period, is_paid):
+    """From stipend_max / stipend_period / is_paid (utils.normalize)."""
+    if is_paid is False:
+        return "Unpaid"
+    if stipend_max is not None and period == "month":
+        if stipend_max < 5000:
+            return "Under ₹5k"
+        if stipend_max < 10000:
+            return "₹5k-10k"
+        return "₹10k+"
+    if is_paid:
+        return "Paid (other)"
+    return "Not specified"
+
+
+def _monthly_stipend(stipend_max, period, is_paid):
+    """Value the /internships stipend bounds compare against (or None)."""
+    if is_paid is False:
+        return 0
+    return stipend_max if period == "month" else None
+
+
+def _bitmap(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for p in positions:
+        bits[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(bits, "little")
+
+
+class FacetIndex:
+    """
+    Facet counts for one catalog version, held in memory.
+
+    Every facet value owns a bitmap (a Python int, bit i = i-th internship),
+    so counts under the active filters are AND + popcount. Results per
+    filter combination are memoized until the next upload.
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.size = len(rows)
+        self.all = (1 << self.size) - 1
+
+        positions = {facet: {} for facet in FACETS}
+        raw_positions = {"source": {}, "location": {}}
+        # per-row numbers for the range filters
+        self.stipends = []
+        self.durations = []
+
+        for i, (source, location, months, stipend_max, period, is_paid) in enumerate(rows):
+            months = float(months) if months is not None else None
+            source = (source or "").strip() or "Not specified"
+            positions["source"].setdefault(source, []).append(i)
+            positions["location"].setdefault(location_bucket(location), []).append(i)
+            positions["duration"].setdefault(duration_bucket(months), []).append(i)
+            positions["stipend"].setdefault(stipend_bucket(stipend_max, period, is_paid), []).append(i)
+            self.stipends.append(_monthly_stipend(stipend_max, period, is_paid))
+            self.durations.append(months)
+
+            # raw values back the ILIKE-style source/location filters
+            raw_positions["source"].setdefault((source or "").lower(), []).append(i)
+            raw_positions["location"].setdefault((location or "").lower(), []).append(i)
+
+        self.bitmaps = {
+            facet: {value: _bitmap(p, self.size) for value, p in values.items()}
+            for facet, values in positions.items()
+        }
+        self.raw_bitmaps = {
+            facet: {value: _bitmap(p, self.size) for value, p in values.items()}
+            for facet, values in raw_positions.items()
+        }
+
+        self._filter_bitmap = lru_cache(maxsize=256)(self._filter_bitmap)
+        self._range_bitmap = lru_cache(maxsize=256)(self._range_bitmap)
+        self.counts = lru_cache(maxsize=1024)(self.counts)
+
+    def _filter_bitmap(self, facet, needle):
+        """Rows whose raw value contains needle, like the SQL ILIKE filter."""
+        needle = needle.lower()
+        bitmap = 0
+        for value, bits in self.raw_bitmaps[facet].items():
+            if needle in value:
+                bitmap |= bits
+        return bitmap
+
+    def _range_bitmap(self, facet, low, high):
+        """Rows whose value lies in [low, high], like the SQL range filters."""
+        values = self.stipends if facet == "stipend" else self.durations
+        return _bitmap(
+            (
+                i for i, v in enumerate(values)
+                if v is not None
+                and (low is None or v >= low)
+                and (high is None or v <= high)
+            ),
+            self.size,
+        )
+
+    def counts(self, location=None, source=None, ranges=()):
+        """
+        {facet: [(value, count), ...]} under the active filters. Each facet
+        ignores its own filter so the user can see the alternatives.
+        ranges: (min_stipend, max_stipend, min_duration, max_duration).
+        """
+        min_stipend, max_stipend, min_duration, max_duration = ranges or (None,) * 4
+
+        location_bits = self._filter_bitmap("location", location) if location else self.all
+        source_bits = self._filter_bitmap("source", source) if source else self.all
+        stipend_bits = (
+            self._range_bitmap("stipend", min_stipend, max_stipend)
+            if min_stipend is not None or max_stipend is not None else self.all
+        )
+        duration_bits = (
+            self._range_bitmap("duration", min_duration, max_duration)
+            if min_duration is not None or max_duration is not None else self.all
+        )
+
+        base = {
+            "source": location_bits & stipend_bits & duration_bits,
+            "location": source_bits & stipend_bits & duration_bits,
+            "duration": location_bits & source_bits & stipend_bits,
+            "stipend": location_bits & source_bits & duration_bits,
+        }
+
+        result = {}
+        for facet in FACETS:
+            counts = [
+                (value, (bits & base[facet]).bit_count())
+                for value, bits in self.bitmaps[facet].items()
+            ]
+            counts = sorted((c for c in counts if c[1]), key=lambda c: (-c[1], c[0]))
+            if facet == "location":
+                counts = counts[:MAX_LOCATION_FACETS]
+            result[facet] = counts
+        return result
+
+
+def _load_rows():
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT source, location, duration_months,
+                   stipend_max, stipend_period, is_paid
+            FROM internships
+            """
+        )
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        conn.close()
+    return rows
+
+
+# ---------------- PER-WORKER INDEX ----------------
+_facets = None
+_lock = threading.Lock()
+
+
+def get_facet_index():
+    """Facets for the current catalog version; rebuilt once per upload."""
+    global _facets
+    version = get_catalog_version()
+    if _facets is None or _facets.version != version:
+        with _lock:
+            if _facets is None or _facets.version != version:
+                _facets = FacetIndex(_load_rows(), version)
+    return _facets
@@ -1,7 +1,45 @@
-import hashlib
+import pandas as pd
+from utils.normalize import NORMALIZER_VERSION
+
+# The listing as a user sees it. Volatile bookkeeping (scraped_at,
+# content_hash itself) is left out, so re-scraping an unchanged listing
+# gives the same fingerprint. Columns derived from these at ingest are
+# covered by NORMALIZER_VERSION instead of their values.
+CONTENT_FIELDS = (
+    "title",
+    "organization",
+    "location",
+    "duration",
+    "stipend",
+    "skills_final",
+    "posted_on",
+    "start_date",
+    "type",
+    "source",
+    "apply_link",
+    "extra_data",
+)
+
+
+def _canonical(df):
+    blank = pd.Series("", index=df.index, dtype=object)
+    canonical = pd.DataFrame({
+        field: (
+            df[field].astype(object).where(df[field].notna(), "").astype(str).str.strip()
+            if field in df.columns else blank
+        )
+        for field in CONTENT_FIELDS
+    })
+    canonical["_normalizer"] = str(NORMALIZER_VERSION)
+    return canonical
+
+
+def frame_hash(df) -> pd.Series:
+    """16-hex-digit fingerprint of CONTENT_FIELDS (+ NORMALIZER_VERSION) for every row, vectorized."""
+    hashed = pd.util.hash_pandas_object(_canonical(df), index=False)
+    return hashed.map("{:016x}".format)
+
 
 def row_hash(row: dict) -> str:
-    canonical = "|".join(
-        str(row[k]) for k in sorted(row.keys()) if k != "content_hash"
-    )
-    return hashlib.md5(canonical.encode("utf-8")).hexdigest()
+    """Same fingerprint for a single scraped row."""
+    return frame_hash(pd.DataFrame([row])).iloc[0]
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# Ingest-time normalization of the free-text stipend / duration columns.
+# Everything here works on whole pandas Series (one regex pass per column),
+# never row by row.
+# -------------------------------------------------
+
+NORMALIZED_COLUMNS = (
+    "stipend_min", "stipend_max", "stipend_period", "is_paid", "duration_months",
+    "apply_by",
+)
+
+# Part of every content_hash (utils.hashing). Bump it whenever the parsing
+# below changes, so the next upload rewrites rows whose raw text did not
+# change but whose NORMALIZED_COLUMNS would.
+NORMALIZER_VERSION = 1
+
+# "₹ 2,000 - 5,000 /month", "5000 to 6000 /month", "₹ 10,000 lump sum", "Unpaid"
+STIPEND_RANGE_RE = r"(\d+)(?:\s*(?:-|to)\s*(\d+))?"
+STIPEND_PERIOD_RE = r"(/\s*month|/\s*week|lump\s*sum)"
+
+# "2 Months", "02 Months", "6 Weeks", "1 Year"
+DURATION_RE = r"(\d+(?:\.\d+)?)\s*(month|week|day|year)"
+MONTHS_PER_UNIT = {"month": 1.0, "week": 12 / 52, "day": 12 / 365, "year": 12.0}
+
+# Largest values the columns hold (stipend_* integer, duration_months
+# numeric(4,1)); anything above is a scraping error and stored as unknown
+STIPEND_MAX = 2 ** 31 - 1
+DURATION_MAX_MONTHS = 999.9
+
+# AICTE: extra_data {"apply_by": "17-Feb-2026"}; read straight from the JSON
+# text so the column never has to be json.loads-ed row by row
+APPLY_BY_RE = r'"apply_by"\s*:\s*"([^"]+)"'
+APPLY_BY_FORMAT = "%d-%b-%Y"
+
+
+def _nullable(series):
+    """NaN → None in an object column, so psycopg2 writes NULL."""
+    return series.astype(object).where(series.notna(), None)
+
+
+def normalize_stipend(stipend):
+    """
+    Series of raw stipend text → DataFrame of
+    stipend_min / stipend_max (whole rupees), stipend_period
+    ('month' | 'week' | 'lump_sum') and is_paid.
+
+    Unpaid → 0 / 0, not paid. "Competitive" / "Performance based" → paid,
+    amount unknown. Amounts in another currency ($) or above STIPEND_MAX
+    are left unknown.
+    """
+    text = stipend.fillna("").astype(str).str.lower()
+    digits = text.str.replace(",", "", regex=False)
+
+    amounts = digits.str.extract(STIPEND_RANGE_RE).astype(float)
+    low = amounts[0]
+    high = amounts[1].fillna(low)
+
+    unpaid = text.str.contains("unpaid", regex=False)
+    foreign = text.str.contains("$", regex=False)
+    low = low.where(~foreign & low.le(STIPEND_MAX))
+    high = high.where(~foreign & high.le(STIPEND_MAX))
+
+    low = low.mask(unpaid, 0.0)
+    high = high.mask(unpaid, 0.0)
+
+    period = (
+        text.str.extract(STIPEND_PERIOD_RE)[0]
+        .str.replace(r"[^a-z]", "", regex=True)
+        .str[:4]
+        .map({"mont": "month", "week": "week", "lump": "lump_sum"})
+    )
+    period = period.where(high.gt(0))
+
+    vague = text.str.contains("competitive|performance", regex=True) | foreign
+    is_paid = pd.Series(np.nan, index=text.index, dtype=object)
+    is_paid = is_paid.mask(high.gt(0) | (vague & high.isna()), True)
+    is_paid = is_paid.mask(unpaid | high.eq(0), False)
+
+    return pd.DataFrame({
+        "stipend_min": _nullable(low.round().astype("Int64")),
+        "stipend_max": _nullable(high.round().astype("Int64")),
+        "stipend_period": _nullable(period),
+        "is_paid": _nullable(is_paid),
+    })
+
+
+def normalize_duration(duration):
+    """Series of raw duration text → Series of months (one decimal), None above DURATION_MAX_MONTHS."""
+    parts = duration.fillna("").astype(str).str.lower().str.extract(DURATION_RE)
+    months = parts[0].astype(float) * parts[1].map(MONTHS_PER_UNIT).astype(float)
+    months = months.round(1)
+    return _nullable(months.where(months.le(DURATION_MAX_MONTHS)))
+
+
+def normalize_deadline(extra_data, start_date):
+    """
+    Series → Series of datetime.date (or None): extra_data.apply_by when
+    present, else start_date when it is an actual date ("Immediately" and
+    blanks stay None).
+    """
+    apply_by = pd.to_datetime(
+        extra_data.fillna("").astype(str).str.extract(APPLY_BY_RE)[0],
+        format=APPLY_BY_FORMAT,
+        errors="coerce",
+    )
+    dated = start_date.where(start_date.astype(str).str.contains(r"\d", regex=True))
+    iso = pd.to_datetime(dated, format="ISO8601", errors="coerce")
+    written = pd.to_datetime(dated.where(iso.isna()), format="mixed", dayfirst=True, errors="coerce")
+    deadline = apply_by.fillna(iso).fillna(written)
+    return _nullable(deadline.dt.date.where(deadline.notna()))
+
+
+def add_normalized_columns(df):
+    """Add NORMALIZED_COLUMNS to an upload DataFrame (any source)."""
+    empty = pd.Series(np.nan, index=df.index, dtype=object)
+
+    stipend = normalize_stipend(df["stipend"] if "stipend" in df.columns else empty)
+    for column in stipend.columns:
+        df[column] = stipend[column]
+
+    df["duration_months"] = normalize_duration(
+        df["duration"] if "duration" in df.columns else empty
+    )
+    df["apply_by"] = normalize_deadline(
+        df["extra_data"] if "extra_data" in df.columns else empty,
+        df["start_date"] if "start_date" in df.columns else empty,
+    )
+    return df
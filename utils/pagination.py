@@ -0,0 +1,56 @@
+import base64
+import json
+import math
+from datetime import datetime
+
+BIGINT_MAX = 2 ** 63 - 1
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else None
+
+
+def _id(value):
+    if isinstance(value, int) and not isinstance(value, bool) and 0 < value <= BIGINT_MAX:
+        return value
+    return None
+
+
+def _rank(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+# What each keyset position holds, in order
+CREATED_AT_ID = (_timestamp, _id)   # /internships, /api/internships, /saved
+RANK_ID = (_rank, _id)              # full-text search
+
+
+def encode_cursor(*values):
+    """Opaque, URL-safe token for a keyset position, e.g. (created_at, id)."""
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values],
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, kinds=CREATED_AT_ID):
+    """
+    Inverse of encode_cursor, checked against kinds (one converter per
+    value). None for a missing or tampered token, so a bad cursor never
+    reaches the typed query parameters.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(kinds):
+        return None
+    try:
+        decoded = tuple(kind(value) for kind, value in zip(kinds, values))
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return None if None in decoded else decoded
@@ -1,11 +1,20 @@
 from utils.db import get_db
+from utils.cache import cached_user
 
 def is_profile_complete(user_id):
     """
     A profile is complete if:
     1. user_profiles row exists
     2. user has at least 3 skills
+
+    Cached per user until upsert_profile invalidates it (see cached_user).
     """
+    return cached_user(
+        user_id, "profile_complete", lambda: _query_profile_complete(user_id)
+    )
+
+
+def _query_profile_complete(user_id):
     conn = get_db()
     cur = conn.cursor()
 
@@ -1,39 +1,73 @@
+import os
 from utils.db import get_db
+from utils.skill_index import get_skill_index
+from utils.cache import cached_user
+from utils.catalog import get_catalog_version
 
-def get_internship_recommendations(user_id, limit=5):
+# "index"  → exact skill-match count over the inverted index (default)
+# "tfidf"  → TF-IDF / cosine ranking over skills_final
+RECOMMENDATION_ENGINE = os.getenv("RECOMMENDATION_ENGINE", "index").lower()
+
+# How many rows per user the batch job materializes
+RECOMMENDATIONS_TOP_N = int(os.getenv("RECOMMENDATIONS_TOP_N", "20"))
+
+
+def _get_user_signals(user_id):
     conn = get_db()
     cur = conn.cursor()
 
     cur.execute(
         """
-        WITH user_skill_set AS (
-            SELECT skill
-            FROM user_skills
-            WHERE user_id = %s
-        )
         SELECT
-            i.id,
-            i.title,
-            i.organization,
-            i.location,
-            COUNT(us.skill) AS match_score
-        FROM internships i
-        LEFT JOIN internship_skills iskill
-            ON iskill.internship_id = i.id
-        LEFT JOIN user_skill_set us
-            ON us.skill = iskill.skill
-        WHERE
-            (
-              i.location = (
-                SELECT location FROM user_profiles WHERE user_id = %s
-              )
-              OR i.location ILIKE 'remote%%'
-            )
-        GROUP BY i.id
-        ORDER BY match_score DESC, i.created_at DESC
-        LIMIT %s;
+            (SELECT location FROM user_profiles WHERE user_id = %s),
+            ARRAY(SELECT skill FROM user_skills WHERE user_id = %s),
+            ARRAY(SELECT interest FROM user_interests WHERE user_id = %s),
+            (SELECT skill_ids FROM user_profiles WHERE user_id = %s)
         """,
-        (user_id, user_id, limit)
+        (user_id, user_id, user_id, user_id)
+    )
+
+    location, skills, interests, skill_ids = cur.fetchone()
+    cur.close()
+    conn.close()
+
+    return location, skills or [], interests or [], skill_ids or []
+
+
+def rank_internships(users, limit=5):
+    """
+    users: list of (skills, interests, location, skill_ids); the TF-IDF
+    engine ranks on the names, the skill index on the dictionary ids.
+    Returns one ranked list per user from the RECOMMENDATION_ENGINE.
+    """
+    if RECOMMENDATION_ENGINE == "tfidf":
+        from utils.tfidf_recommender import get_tfidf_recommender
+        return get_tfidf_recommender().recommend_many(users, limit)
+
+    index = get_skill_index()
+    return [index.top_k(skill_ids, location, limit) for _, _, location, skill_ids in users]
+
+
+def compute_internship_recommendations(user_id, limit=5):
+    """Live ranking for one user (no materialized rows involved)."""
+    location, skills, interests, skill_ids = _get_user_signals(user_id)
+    return rank_internships([(skills, interests, location, skill_ids)], limit)[0]
+
+
+def _get_stored_recommendations(user_id, limit):
+    conn = get_db()
+    cur = conn.cursor()
+
+    cur.execute(
+        """
+        SELECT i.id, i.title, i.organization, i.location, r.match_score
+        FROM user_recommendations r
+        JOIN internships i ON i.id = r.internship_id
+        WHERE r.user_id = %s
+        ORDER BY r.rank
+        LIMIT %s
+        """,
+        (user_id, limit)
     )
 
     rows = cur.fetchall()
@@ -43,3 +77,37 @@ def get_internship_recommendations(user_id, limit=5):
     conn.close()
 
     return results
+
+
+def get_internship_recommendations(user_id, limit=5):
+    """
+    Dashboard recommendations: the rows precomputed by
+    utils.batch_recommendations (one primary-key lookup), falling back to a
+    live in-memory ranking for users the batch has not covered yet.
+    Cached per (user, catalog version) until the profile changes.
+    """
+    return cached_user(
+        user_id,
+        f"recs:{get_catalog_version()}:{limit}",
+        lambda: _load_recommendations(user_id, limit),
+    )
+
+
+def _load_recommendations(user_id, limit):
+    results = _get_stored_recommendations(user_id, limit)
+    if results:
+        return results
+
+    return compute_internship_recommendations(user_id, limit)
+
+
+def warm_skill_index():
+    """Build the configured engine at startup so the first dashboard hit is fast."""
+    try:
+        if RECOMMENDATION_ENGINE == "tfidf":
+            from utils.tfidf_recommender import get_tfidf_recommender
+            get_tfidf_recommender()
+        else:
+            get_skill_index()
+    except Exception as e:
+        print(f"⚠️ Recommendation engine not built at startup: {e}")
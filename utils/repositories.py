@@ -0,0 +1,524 @@
+import itertools
+import os
+import re
+from markupsafe import Markup, escape
+from psycopg2.extras import RealDictCursor
+from utils.pagination import encode_cursor
+
+# Supabase's transaction-mode pooler (port 6543) does not keep session
+# state, so server-side prepared statements can be switched off there.
+USE_PREPARED = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+# ---------------- COLUMN SETS ----------------
+# Only what the templates render; never SELECT *.
+INTERNSHIP_LIST_COLUMNS = (
+    "id", "title", "organization", "location", "duration", "stipend",
+    "source", "posted_on", "apply_link", "created_at",
+)
+
+INTERNSHIP_DETAIL_COLUMNS = INTERNSHIP_LIST_COLUMNS + (
+    "skills_final", "start_date", "type", "extra_data",
+    "stipend_min", "stipend_max", "stipend_period", "is_paid", "duration_months",
+    "apply_by",
+)
+
+SAVED_INTERNSHIP_COLUMNS = ("id", "title", "organization", "location")
+
+
+# rows fetched per round trip by server-side (streaming) cursors
+STREAM_BATCH_SIZE = 500
+
+_stream_ids = itertools.count(1)
+
+
+def _cols(columns, alias=None):
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + c for c in columns)
+
+
+# ---------------- RANGE FILTERS ----------------
+# Numeric columns filled at ingest by utils.normalize. Stipend bounds are
+# ₹ per month, so weekly / lump-sum stipends only match with no stipend
+# bound set; unpaid listings count as 0.
+RANGE_FILTERS = ("min_stipend", "max_stipend", "min_duration", "max_duration")
+
+
+def _range_sql(placeholders, alias=None):
+    """WHERE fragment for RANGE_FILTERS; a NULL parameter disables its bound."""
+    p = f"{alias}." if alias else ""
+    min_stipend, max_stipend, min_duration, max_duration = placeholders
+    monthly = f"({p}stipend_period = 'month' OR {p}is_paid = false)"
+    return f"""
+              AND ({min_stipend}::int IS NULL OR ({p}stipend_max >= {min_stipend} AND {monthly}))
+              AND ({max_stipend}::int IS NULL OR ({p}stipend_max <= {max_stipend} AND {monthly}))
+              AND ({min_duration}::numeric IS NULL OR {p}duration_months >= {min_duration})
+              AND ({max_duration}::numeric IS NULL OR {p}duration_months <= {max_duration})"""
+
+
+def _range_params(ranges):
+    ranges = ranges or {}
+    return [ranges.get(name) for name in RANGE_FILTERS]
+
+
+# ts_headline markers; swapped for <mark> after HTML-escaping the text
+HL_START, HL_STOP = "[[hl]]", "[[/hl]]"
+
+
+def highlight(text):
+    if not text:
+        return text
+    safe = str(escape(text))
+    return Markup(safe.replace(HL_START, "<mark>").replace(HL_STOP, "</mark>"))
+
+
+class BaseRepository:
+    """
+    Shares one pooled connection (utils.db.get_db) between queries.
+
+    Hot queries are written with $1..$n placeholders and run as server-side
+    prepared statements: PREPARE once per pooled connection, EXECUTE after.
+    Repositories never commit; the caller owns the transaction.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def _cursor(self):
+        return self.conn.cursor(cursor_factory=RealDictCursor)
+
+    def _execute(self, cur, name, sql, params=()):
+        prepared = getattr(self.conn, "prepared", None)
+
+        if not USE_PREPARED or prepared is None:
+            # same statement, plain client-side parameters
+            plain = re.sub(r"\$(\d+)", r"%(p\1)s", sql.replace("%", "%%"))
+            cur.execute(plain, {f"p{i}": v for i, v in enumerate(params, 1)})
+            return
+
+        if name not in prepared:
+            cur.execute(f"PREPARE {name} AS {sql}")
+            prepared.add(name)
+
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            cur.execute(f"EXECUTE {name} ({placeholders})", tuple(params))
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+
+# ---------------- INTERNSHIPS ----------------
+class InternshipRepository(BaseRepository):
+
+    def list_page(self, location=None, source=None, limit=12, after=None, before=None,
+                  ranges=None):
+        """
+        Keyset page ordered by (created_at, id) DESC, optionally narrowed by
+        RANGE_FILTERS (ranges: {name: value}).
+
+        after / before are (created_at, id) positions decoded from a cursor
+        token; the page is fetched with an index range scan on
+        internships_created_at_id_idx, so page 500 costs what page 1 does.
+        Returns (rows, next_cursor, prev_cursor).
+        """
+        if after:
+            name, keyset, order = "internships_page_after", "AND (created_at, id) < ($8::timestamptz, $9::bigint)", "DESC"
+        elif before:
+            name, keyset, order = "internships_page_before", "AND (created_at, id) > ($8::timestamptz, $9::bigint)", "ASC"
+        else:
+            name, keyset, order = "internships_page_first", "", "DESC"
+
+        params = [location or None, source or None, limit + 1]
+        params += _range_params(ranges)
+        params += list(after or before or ())
+
+        cur = self._cursor()
+        self._execute(
+            cur,
+            name,
+            f"""
+            SELECT {_cols(INTERNSHIP_LIST_COLUMNS)}
+            FROM internships
+            WHERE ($1::text IS NULL OR location ILIKE '%' || $1 || '%')
+              AND ($2::text IS NULL OR source ILIKE '%' || $2 || '%')
+              {_range_sql(("$4", "$5", "$6", "$7"))}
+              {keyset}
+            ORDER BY created_at {order}, id {order}
+            LIMIT $3
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+        cur.close()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before:
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            if has_more or before:
+                next_cursor = encode_cursor(last["created_at"], last["id"])
+            if after or (before and has_more):
+                prev_cursor = encode_cursor(first["created_at"], first["id"])
+
+        return rows, next_cursor, prev_cursor
+
+    def search(self, query, location=None, source=None, limit=12, after=None, ranges=None):
+        """
+        Ranked full-text search on the generated search_tsv column (GIN).
+        Paged by keyset on (rank, id); only the returned page pays for
+        ts_headline. Returns (rows, next_cursor).
+        """
+        keyset = "AND (rank, id) < ($9::float8, $10::bigint)" if after else ""
+        params = [query, location or None, source or None, limit + 1]
+        params += _range_params(ranges)
+        params += list(after or ())
+
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "internships_search_after" if after else "internships_search_first",
+            f"""
+            WITH q AS (SELECT websearch_to_tsquery('english', $1) AS tsq),
+            hits AS (
+                SELECT {_cols(INTERNSHIP_LIST_COLUMNS, "i")}, i.skills_final,
+                       ts_rank_cd(i.search_tsv, q.tsq)::float8 AS rank
+                FROM internships i, q
+                WHERE i.search_tsv @@ q.tsq
+                  AND ($2::text IS NULL OR i.location ILIKE '%' || $2 || '%')
+                  AND ($3::text IS NULL OR i.source ILIKE '%' || $3 || '%')
+                  {_range_sql(("$5", "$6", "$7", "$8"), "i")}
+            ),
+            page AS (
+                SELECT * FROM hits
+                WHERE true {keyset}
+                ORDER BY rank DESC, id DESC
+                LIMIT $4
+            )
+            SELECT {_cols(INTERNSHIP_LIST_COLUMNS, "page")}, page.rank,
+                   ts_headline('english', page.title, q.tsq,
+                       'StartSel=[[hl]], StopSel=[[/hl]], HighlightAll=true') AS title_hl,
+                   ts_headline('english',
+                       coalesce(page.organization, '') || ' · ' ||
+                       translate(coalesce(page.skills_final, ''), '[]''"', ''),
+                       q.tsq,
+                       'StartSel=[[hl]], StopSel=[[/hl]], MaxWords=20, MinWords=6') AS snippet
+            FROM page, q
+            ORDER BY page.rank DESC, page.id DESC
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+        cur.close()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        for row in rows:
+            row["title_hl"] = highlight(row["title_hl"])
+            row["snippet"] = highlight(row["snippet"])
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+        return rows, next_cursor
+
+    def get(self, internship_id):
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "internships_get",
+            f"""
+            SELECT {_cols(INTERNSHIP_DETAIL_COLUMNS)}
+            FROM internships
+            WHERE id = $1
+            """,
+            (internship_id,),
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def upcoming_deadlines(self, user_id, limit=5):
+        """
+        A user's next open deadlines: saved internships first, then the
+        materialized recommendations, each by apply_by. One query over the
+        per-user indexes (saved covering index, user_recommendations PK);
+        only those few candidates are joined to internships.
+        """
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "internships_upcoming_deadlines",
+            """
+            WITH picks AS (
+                SELECT s.opportunity_id AS id, true AS saved
+                FROM saved_opportunities s
+                WHERE s.user_id = $1
+                  AND s.opportunity_type = 'internship'
+                UNION ALL
+                SELECT r.internship_id, false
+                FROM user_recommendations r
+                WHERE r.user_id = $1
+            )
+            SELECT i.id, i.title, i.organization, i.apply_by, bool_or(p.saved) AS saved
+            FROM picks p
+            JOIN internships i ON i.id = p.id
+            WHERE i.apply_by >= CURRENT_DATE
+            GROUP BY i.id, i.title, i.organization, i.apply_by
+            ORDER BY bool_or(p.saved) DESC, i.apply_by, i.id
+            LIMIT $2
+            """,
+            (user_id, limit),
+        )
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+
+    def stream(self, location=None, source=None, after=None, limit=None,
+               columns=INTERNSHIP_DETAIL_COLUMNS, batch_size=STREAM_BATCH_SIZE,
+               ranges=None):
+        """
+        Yield rows in listing order, (created_at, id) DESC, through a
+        server-side cursor so only batch_size rows are held at a time.
+        Same filters and cursor position as list_page.
+        """
+        params = {
+            "location": location or None,
+            "source": source or None,
+            "after_ts": after[0] if after else None,
+            "after_id": after[1] if after else None,
+            "limit": limit,
+        }
+        params.update(zip(RANGE_FILTERS, _range_params(ranges)))
+
+        cur = self.conn.cursor(
+            name=f"internships_stream_{next(_stream_ids)}",
+            cursor_factory=RealDictCursor,
+        )
+        cur.itersize = batch_size
+        try:
+            cur.execute(
+                f"""
+                SELECT {_cols(columns)}
+                FROM internships
+                WHERE (%(location)s::text IS NULL OR location ILIKE '%%' || %(location)s || '%%')
+                  AND (%(source)s::text IS NULL OR source ILIKE '%%' || %(source)s || '%%')
+                  {_range_sql([f"%({name})s" for name in RANGE_FILTERS])}
+                  AND (%(after_ts)s::timestamptz IS NULL
+                       OR (created_at, id) < (%(after_ts)s::timestamptz, %(after_id)s::bigint))
+                ORDER BY created_at DESC, id DESC
+                LIMIT %(limit)s
+                """,
+                params,
+            )
+            yield from cur
+        finally:
+            cur.close()
+
+    def existing_ids(self, ids):
+        """The subset of ids that are internships."""
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "internships_existing_ids",
+            "SELECT id FROM internships WHERE id = ANY($1::bigint[])",
+            (list(ids),),
+        )
+        found = {int(r["id"]) for r in cur.fetchall()}
+        cur.close()
+        return found
+
+
+# ---------------- USERS ----------------
+class UserRepository(BaseRepository):
+
+    def get_local_login(self, username):
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "users_local_login",
+            """
+            SELECT id, password_hash
+            FROM users
+            WHERE username = $1
+              AND auth_provider = 'local'
+              AND is_active = true
+            """,
+            (username,),
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def username_exists(self, username):
+        cur = self._cursor()
+        cur.execute("SELECT 1 FROM users WHERE username = %s", (username,))
+        exists = cur.fetchone() is not None
+        cur.close()
+        return exists
+
+    def get_by_email(self, email):
+        cur = self._cursor()
+        cur.execute(
+            "SELECT id, display_name FROM users WHERE email = %s",
+            (email,)
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def get_display_name(self, user_id):
+        cur = self._cursor()
+        cur.execute("SELECT display_name FROM users WHERE id = %s", (user_id,))
+        row = cur.fetchone()
+        cur.close()
+        return row["display_name"] if row else ""
+
+    def get_email(self, user_id):
+        cur = self._cursor()
+        cur.execute("SELECT email FROM users WHERE id = %s", (user_id,))
+        row = cur.fetchone()
+        cur.close()
+        return row["email"] if row else None
+
+    def create_local(self, username, password_hash):
+        cur = self._cursor()
+        cur.execute(
+            """
+            INSERT INTO users (username, display_name, password_hash, auth_provider)
+            VALUES (%s, %s, %s, 'local')
+            RETURNING id, display_name
+            """,
+            (username, username, password_hash)
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def create_google(self, email, display_name):
+        cur = self._cursor()
+        cur.execute(
+            """
+            INSERT INTO users (email, display_name, auth_provider)
+            VALUES (%s, %s, 'google')
+            RETURNING id, display_name
+            """,
+            (email, display_name)
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def get_profile(self, user_id):
+        cur = self._cursor()
+        cur.execute(
+            "SELECT * FROM user_profiles WHERE user_id = %s",
+            (user_id,)
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+
+    def get_skills(self, user_id):
+        cur = self._cursor()
+        cur.execute("SELECT skill FROM user_skills WHERE user_id = %s", (user_id,))
+        skills = [r["skill"] for r in cur.fetchall()]
+        cur.close()
+        return skills
+
+    def get_interests(self, user_id):
+        cur = self._cursor()
+        cur.execute(
+            "SELECT interest FROM user_interests WHERE user_id = %s",
+            (user_id,)
+        )
+        interests = [r["interest"] for r in cur.fetchall()]
+        cur.close()
+        return interests
+
+
+# ---------------- SAVED OPPORTUNITIES ----------------
+class SavedRepository(BaseRepository):
+
+    def saved_ids(self, user_id, opportunity_type="internship"):
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "saved_ids",
+            """
+            SELECT opportunity_id
+            FROM saved_opportunities
+            WHERE user_id = $1
+              AND opportunity_type = $2
+            """,
+            (user_id, opportunity_type),
+        )
+        ids = set(int(r["opportunity_id"]) for r in cur.fetchall())
+        cur.close()
+        return ids
+
+    def save(self, user_id, opportunity_id, opportunity_type):
+        cur = self._cursor()
+        cur.execute(
+            """
+            INSERT INTO saved_opportunities (user_id, opportunity_id, opportunity_type)
+            VALUES (%s, %s, %s)
+            ON CONFLICT DO NOTHING
+            """,
+            (user_id, opportunity_id, opportunity_type)
+        )
+        cur.close()
+
+    def unsave(self, user_id, opportunity_id, opportunity_type):
+        cur = self._cursor()
+        cur.execute(
+            """
+            DELETE FROM saved_opportunities
+            WHERE user_id = %s
+              AND opportunity_id = %s
+              AND opportunity_type = %s
+            """,
+            (user_id, opportunity_id, opportunity_type)
+        )
+        cur.close()
+
+    def saved_internships(self, user_id, limit=20, after=None):
+        """
+        One page of saved internships, most recently saved first, keyset
+        on (created_at, opportunity_id) of saved_opportunities
+        (saved_opportunities_user_type_created_idx). after is a
+        (saved_at, id) tuple from a cursor token.
+        Returns (rows, next_cursor).
+        """
+        keyset = (
+            "AND (s.created_at, s.opportunity_id) < ($3::timestamptz, $4::bigint)"
+            if after else ""
+        )
+        params = [user_id, limit + 1] + list(after or ())
+
+        cur = self._cursor()
+        self._execute(
+            cur,
+            "saved_internships_after" if after else "saved_internships_first",
+            f"""
+            SELECT {_cols(SAVED_INTERNSHIP_COLUMNS, "i")}, s.created_at AS saved_at
+            FROM saved_opportunities s
+            JOIN internships i ON i.id = s.opportunity_id
+            WHERE s.user_id = $1
+              AND s.opportunity_type = 'internship'
+              {keyset}
+            ORDER BY s.created_at DESC, s.opportunity_id DESC
+            LIMIT $2
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+        cur.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["saved_at"], rows[-1]["id"])
+        return rows, next_cursor
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, session, make_response, copy_current_request_context
+from utils.cache import get_cache
+from utils.catalog import get_catalog_version
+
+# Rendered pages are fresh for PAGE_CACHE_TTL seconds, then served stale
+# for up to PAGE_CACHE_STALE more while one background render refreshes them.
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300"))
+PAGE_CACHE_STALE = float(os.getenv("PAGE_CACHE_STALE", "3600"))
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def page_cache_key():
+    """
+    route + normalized query args + catalog version + logged-in flag.
+
+    Empty args are dropped and the rest sorted, so ?source=&location=Pune
+    and ?location=Pune share an entry. The navbar only depends on whether
+    someone is logged in, so that is the only session bit in the key.
+    """
+    args = sorted(
+        (k, v) for k, values in request.args.lists() for v in values if v != ""
+    )
+    audience = "user" if session.get("user_id") else "anon"
+    return f"page:{request.path}?{urlencode(args)}:{get_catalog_version()}:{audience}"
+
+
+def _render(view, args, kwargs):
+    response = make_response(view(*args, **kwargs))
+    if response.status_code != 200:
+        return response, None
+    body = response.get_data(as_text=True)
+    entry = {
+        "body": body,
+        "mimetype": response.mimetype,
+        "etag": hashlib.md5(body.encode()).hexdigest(),
+        "rendered_at": time.time(),
+    }
+    return response, entry
+
+
+def _store(key, entry):
+    get_cache().set(key, entry, PAGE_CACHE_TTL + PAGE_CACHE_STALE)
+
+
+def _revalidate(key, view, args, kwargs):
+    """Re-render one stale entry in the background (once per key)."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    @copy_current_request_context
+    def refresh():
+        try:
+            _, entry = _render(view, args, kwargs)
+            if entry:
+                _store(key, entry)
+        except Exception as e:
+            print(f"⚠️ Page refresh failed for {key}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def cached_page(view=None, overlay=None):
+    """
+    Cache a GET view's rendered HTML (see page_cache_key).
+
+    overlay(body) → body runs on every response, cached or not, to put the
+    per-user bits (e.g. saved buttons) back on the shared page. Responses
+    carry an ETag of what was actually sent, so repeat visits get a 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not PAGE_CACHE_ENABLED or request.method != "GET":
+                response = make_response(view(*args, **kwargs))
+                if overlay is not None and response.status_code == 200:
+                    response.set_data(overlay(response.get_data(as_text=True)))
+                return response
+
+            key = page_cache_key()
+            entry = get_cache().get(key)
+
+            if entry is None:
+                response, entry = _render(view, args, kwargs)
+                if entry is None:
+                    return response
+                _store(key, entry)
+            elif time.time() - entry["rendered_at"] > PAGE_CACHE_TTL:
+                _revalidate(key, view, args, kwargs)
+
+            body, etag = entry["body"], entry["etag"]
+            if overlay is not None:
+                personal = overlay(body)
+                if personal is not body:
+                    body = personal
+                    etag = hashlib.md5(body.encode()).hexdigest()
+
+            response = make_response(body)
+            response.mimetype = entry["mimetype"]
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = (
+                "private, no-cache" if session.get("user_id") else "public, no-cache"
+            )
+            response.vary.add("Cookie")
+            return response.make_conditional(request)
+
+        return wrapper
+
+    if view is not None:
+        return decorator(view)
+    return decorator
@@ -0,0 +1,236 @@
+import atexit
+import os
+import threading
+import psycopg2
+from psycopg2.extras import execute_values
+from utils.db import get_pool
+
+# Write-behind for save / unsave clicks. Ops are coalesced in memory and
+# written in multi-row statements every SAVED_FLUSH_INTERVAL seconds, or as
+# soon as SAVED_FLUSH_SIZE distinct ops are waiting. SAVED_WRITE_BEHIND=false
+# writes every submit straight through (same code path, flushed at once).
+SAVED_WRITE_BEHIND = os.getenv("SAVED_WRITE_BEHIND", "true").lower() == "true"
+SAVED_FLUSH_INTERVAL = float(os.getenv("SAVED_FLUSH_INTERVAL", "2"))
+SAVED_FLUSH_SIZE = int(os.getenv("SAVED_FLUSH_SIZE", "200"))
+
+ACTIONS = ("save", "unsave")
+
+# A row that fails with one of these fails every time (bad value, deleted
+# user or listing): it is dropped and logged. Anything else (connection
+# lost, server restart) puts the ops back for the next flush.
+PERMANENT_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError)
+
+
+class SavedWriteBuffer:
+    """
+    Pending saved_opportunities changes for this worker.
+
+    Ops are keyed by (user_id, opportunity_type, opportunity_id); the last
+    action wins, so save → unsave → save on one card is a single INSERT.
+    A flush swaps the pending dict out and writes it in one transaction,
+    one savepoint per user: one INSERT ... ON CONFLICT DO NOTHING for
+    saves, one DELETE for unsaves. When a user's rows hit a
+    PERMANENT_ERRORS error they are retried one by one and the bad ones
+    dropped, so they never hold up anyone else's. Any other failure puts
+    the whole batch back (unless newer ops arrived) for the next flush.
+
+    Durability: ops are in memory for at most one flush interval. They are
+    flushed at interpreter exit (atexit, which gunicorn's graceful worker
+    shutdown runs) and before any read of the same user's saved items in
+    this worker, so a user always reads their own writes.
+    """
+
+    def __init__(self, flush_interval=SAVED_FLUSH_INTERVAL, flush_size=SAVED_FLUSH_SIZE):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending = {}                 # (user_id, type, id) -> action
+        self._inflight = set()             # users whose ops are being written
+        self._lock = threading.Lock()      # guards _pending
+        self._flush_lock = threading.Lock()  # one writer at a time
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+
+    # ---------------- SUBMIT ----------------
+    def submit(self, user_id, ops):
+        """ops: iterable of (opportunity_id, opportunity_type, action)."""
+        with self._lock:
+            for opportunity_id, opportunity_type, action in ops:
+                self._pending[(str(user_id), opportunity_type, int(opportunity_id))] = action
+            backlog = len(self._pending)
+
+        if not SAVED_WRITE_BEHIND:
+            self.flush()
+        elif backlog >= self.flush_size:
+            self._wake.set()
+        self._ensure_thread()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    # ---------------- FLUSH ----------------
+    def flush(self, user_id=None):
+        """Write pending ops (all of them, or one user's) and commit."""
+        with self._flush_lock:
+            with self._lock:
+                if user_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    user_id = str(user_id)
+                    batch = {k: v for k, v in self._pending.items() if k[0] == user_id}
+                    for key in batch:
+                        del self._pending[key]
+                self._inflight = {key[0] for key in batch}
+
+            if not batch:
+                return 0
+
+            try:
+                written, dropped = self._write(batch)
+            except Exception:
+                with self._lock:
+                    for key, action in batch.items():
+                        self._pending.setdefault(key, action)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight = set()
+
+            self.flushes += 1
+            self.written += written
+            self.dropped += dropped
+            return written
+
+    def flush_user(self, user_id):
+        """
+        Read-your-writes: called before reading a user's saved items. Also
+        waits for a flush that is writing this user's ops right now.
+        """
+        with self._lock:
+            user_id = str(user_id)
+            if user_id not in self._inflight and not any(
+                k[0] == user_id for k in self._pending
+            ):
+                return 0
+        return self.flush(user_id)
+
+    def _write(self, batch):
+        """(written, dropped) for one batch, committed in one transaction."""
+        by_user = {}
+        for key, action in batch.items():
+            by_user.setdefault(key[0], {})[key] = action
+
+        written = dropped = 0
+        conn = get_pool().getconn()
+        try:
+            cur = conn.cursor()
+            for ops in by_user.values():
+                if self._write_ops(cur, ops) is None:
+                    written += len(ops)
+                    continue
+                # one bad row sank the user's statements: find it
+                for key, action in ops.items():
+                    error = self._write_ops(cur, {key: action})
+                    if error is None:
+                        written += 1
+                    else:
+                        dropped += 1
+                        print(f"⚠️ Dropped saved-item op {action} {key}: {error}".strip())
+            conn.commit()
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return written, dropped
+
+    def _write_ops(self, cur, ops):
+        """Write ops under a savepoint; the error (rolled back) if one was permanent."""
+        saves = [k for k, action in ops.items() if action == "save"]
+        unsaves = [k for k, action in ops.items() if action == "unsave"]
+
+        cur.execute("SAVEPOINT saved_ops")
+        try:
+            if saves:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO saved_opportunities (user_id, opportunity_type, opportunity_id)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                    """,
+                    saves,
+                    page_size=1000,
+                )
+            if unsaves:
+                cur.execute(
+                    """
+                    DELETE FROM saved_opportunities
+                    WHERE (user_id, opportunity_type, opportunity_id) IN %s
+                    """,
+                    (tuple(unsaves),)
+                )
+        except PERMANENT_ERRORS as e:
+            cur.execute("ROLLBACK TO SAVEPOINT saved_ops")
+            return e
+        cur.execute("RELEASE SAVEPOINT saved_ops")
+        return None
+
+    # ---------------- BACKGROUND FLUSHER ----------------
+    def _ensure_thread(self):
+        if self._thread is None and SAVED_WRITE_BEHIND and not self._stopped:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Saved-items flush failed, will retry: {e}")
+
+    def close(self):
+        """Stop the flusher and write whatever is still pending."""
+        self._stopped = True
+        self._wake.set()
+        try:
+            written = self.flush()
+            if written:
+                print(f"💾 Flushed {written} pending saved-item changes")
+        except Exception as e:
+            print(f"❌ Could not flush {self.pending_count()} saved-item changes: {e}")
+
+    def stats(self):
+        return {
+            "pending": self.pending_count(),
+            "flushes": self.flushes,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_behind": SAVED_WRITE_BEHIND,
+        }
+
+
+# ---------------- PER-WORKER BUFFER ----------------
+_buffer = None
+_buffer_pid = None
+_buffer_lock = threading.Lock()
+
+
+def get_saved_buffer():
+    global _buffer, _buffer_pid
+    if _buffer is None or _buffer_pid != os.getpid():
+        with _buffer_lock:
+            if _buffer is None or _buffer_pid != os.getpid():
+                _buffer = SavedWriteBuffer()
+                _buffer_pid = os.getpid()
+                atexit.register(_buffer.close)
+    return _buffer
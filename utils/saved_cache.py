@@ -0,0 +1,118 @@
+import os
+import time
+from array import array
+from bisect import bisect_left
+from utils.db import get_db
+from utils.cache import get_cache, user_cache_enabled, user_cache_prefix
+from utils.repositories import SavedRepository
+from utils.saved_buffer import get_saved_buffer, SAVED_FLUSH_INTERVAL
+
+# How long a user's saved-id set is cached. The key carries a per-user
+# version held in the cache itself (so shared by every worker where
+# per-user entries are cached at all, see utils.cache.cached_user) and
+# bumped atomically on every save / unsave, so no session or worker reads
+# a set from before the write.
+SAVED_IDS_TTL = float(os.getenv("SAVED_IDS_TTL", "300"))
+# Right after a write, the worker that took it may still hold the ops in its
+# write-behind buffer; sets loaded in that window are only kept until it ends.
+SAVED_SETTLE_SECONDS = 2 * SAVED_FLUSH_INTERVAL
+
+
+class SavedIdSet:
+    """
+    One user's saved opportunity ids as a sorted array('q'): 8 bytes per id
+    and O(log n) membership, so a listing checks only its 12 cards.
+    Never changed once built (readers in other threads may hold it);
+    updated() returns a new set.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids=()):
+        self.ids = array("q", sorted(set(ids)))
+
+    def __contains__(self, opportunity_id):
+        i = bisect_left(self.ids, opportunity_id)
+        return i < len(self.ids) and self.ids[i] == opportunity_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def updated(self, saves, unsaves):
+        return SavedIdSet(set(self.ids).union(saves).difference(unsaves))
+
+
+def _key(user_id, opportunity_type, version):
+    return f"{user_cache_prefix(user_id)}saved:{opportunity_type}:{version}"
+
+
+def _version_key(user_id):
+    return f"{user_cache_prefix(user_id)}saved_version"
+
+
+def _written_key(user_id):
+    return f"{user_cache_prefix(user_id)}saved_at"
+
+
+def _fresh_version():
+    # a version key that expired or was evicted restarts from the clock,
+    # past any number handed out before, so old sets are never read again
+    return int(time.time() * 1000)
+
+
+def _ttl(written_at):
+    settling = written_at + SAVED_SETTLE_SECONDS - time.time()
+    return min(settling, SAVED_IDS_TTL) if settling > 0 else SAVED_IDS_TTL
+
+
+def _load(user_id, opportunity_type):
+    get_saved_buffer().flush_user(user_id)
+    return SavedIdSet(SavedRepository(get_db()).saved_ids(user_id, opportunity_type))
+
+
+def get_saved_ids(user_id, opportunity_type="internship"):
+    """Cached SavedIdSet; loaded once per version (after this worker's pending writes)."""
+    if not user_cache_enabled():
+        return _load(user_id, opportunity_type)
+
+    cache = get_cache()
+    version = cache.counter(_version_key(user_id), _fresh_version(), SAVED_IDS_TTL)
+    key = _key(user_id, opportunity_type, version)
+
+    saved = cache.get(key)
+    if saved is None:
+        saved = _load(user_id, opportunity_type)
+        cache.set(key, saved, _ttl(cache.get(_written_key(user_id), 0.0)))
+    return saved
+
+
+def record_saved_ops(user_id, ops):
+    """
+    The save / unsave path: queue ops for the database, bump the user's
+    version and carry the previous version's set, if cached, over to it,
+    so the next listing shows the change without a query. The bump is
+    atomic, so concurrent writers never share a version.
+    ops: (opportunity_id, opportunity_type, action) tuples.
+    """
+    get_saved_buffer().submit(user_id, ops)
+    if not user_cache_enabled():
+        return
+
+    cache = get_cache()
+    version = cache.incr(_version_key(user_id), _fresh_version(), SAVED_IDS_TTL)
+    written_at = time.time()
+    cache.set(_written_key(user_id), written_at, SAVED_SETTLE_SECONDS)
+
+    for opportunity_type in {op[1] for op in ops}:
+        old_key = _key(user_id, opportunity_type, version - 1)
+        saved = cache.get(old_key)
+        if saved is None:
+            continue
+        saves = [i for i, t, action in ops if t == opportunity_type and action == "save"]
+        unsaves = [i for i, t, action in ops if t == opportunity_type and action != "save"]
+        cache.set(
+            _key(user_id, opportunity_type, version),
+            saved.updated(saves, unsaves),
+            _ttl(written_at),
+        )
+        cache.delete(old_key)
@@ -0,0 +1,188 @@
+from utils.db import get_db
+
+# -------------------------------------------------
+# Idempotent DDL for tables / indexes the app adds on top of the base
+# Supabase schema. Applied by utils.bulk_upload before every run, or by
+# hand with:  python -m utils.schema
+# -------------------------------------------------
+STATEMENTS = [
+    # ---------- catalog version (bumped after every upload) ----------
+    """
+    CREATE TABLE IF NOT EXISTS catalog_meta (
+        id          int PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        version     bigint NOT NULL DEFAULT 0,
+        updated_at  timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    "INSERT INTO catalog_meta (id) VALUES (1) ON CONFLICT DO NOTHING",
+
+    # ---------- precomputed dashboard recommendations ----------
+    # user_id copies the type of users.id so the foreign key always fits
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('user_recommendations') IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE user_recommendations (
+                    user_id          %s NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                    rank             smallint NOT NULL,
+                    internship_id    bigint NOT NULL REFERENCES internships(id) ON DELETE CASCADE,
+                    match_score      integer NOT NULL DEFAULT 0,
+                    score            real,
+                    catalog_version  bigint NOT NULL DEFAULT 0,
+                    computed_at      timestamptz NOT NULL DEFAULT now(),
+                    PRIMARY KEY (user_id, rank)
+                )',
+                (SELECT format_type(atttypid, atttypmod)
+                 FROM pg_attribute
+                 WHERE attrelid = 'users'::regclass AND attname = 'id')
+            );
+        END IF;
+    END $$
+    """,
+
+    # ---------- keyset pagination for /internships ----------
+    """
+    CREATE INDEX IF NOT EXISTS internships_created_at_id_idx
+        ON internships (created_at DESC, id DESC)
+    """,
+
+    # ---------- change tracking (the skill index re-reads rows past its watermark) ----------
+    # set on insert, on a content change and when the row's skills change
+    "ALTER TABLE internships ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now()",
+    """
+    CREATE INDEX IF NOT EXISTS internships_updated_at_idx
+        ON internships (updated_at)
+    """,
+
+    # ---------- numeric stipend / duration (utils.normalize, at ingest) ----------
+    """
+    ALTER TABLE internships
+        ADD COLUMN IF NOT EXISTS stipend_min     integer,
+        ADD COLUMN IF NOT EXISTS stipend_max     integer,
+        ADD COLUMN IF NOT EXISTS stipend_period  text,
+        ADD COLUMN IF NOT EXISTS is_paid         boolean,
+        ADD COLUMN IF NOT EXISTS duration_months numeric(4,1)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS internships_stipend_max_idx
+        ON internships (stipend_max)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS internships_duration_months_idx
+        ON internships (duration_months)
+    """,
+
+    # ---------- application deadlines (utils.normalize, at ingest) ----------
+    "ALTER TABLE internships ADD COLUMN IF NOT EXISTS apply_by date",
+    """
+    CREATE INDEX IF NOT EXISTS internships_apply_by_idx
+        ON internships (apply_by, id)
+        WHERE apply_by IS NOT NULL
+    """,
+
+    # ---------- internship_skills (synced from skills_final by the uploader) ----------
+    """
+    CREATE INDEX IF NOT EXISTS internship_skills_skill_internship_idx
+        ON internship_skills (skill, internship_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS internship_skills_internship_id_idx
+        ON internship_skills (internship_id)
+    """,
+
+    # ---------- skill dictionary (utils.skills.dictionary) ----------
+    # key is skill_key(name); alias is skill_key() of a variant spelling
+    """
+    CREATE TABLE IF NOT EXISTS skills (
+        id    serial PRIMARY KEY,
+        name  text NOT NULL,
+        key   text NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS skill_aliases (
+        alias     text PRIMARY KEY,
+        skill_id  integer NOT NULL REFERENCES skills(id) ON DELETE CASCADE
+    )
+    """,
+    # derived: recorded by the uploader's canonicalizer, not SEED_ALIASES,
+    # so a later upload may point it elsewhere or drop it
+    "ALTER TABLE skill_aliases ADD COLUMN IF NOT EXISTS derived boolean NOT NULL DEFAULT false",
+    # sorted dictionary ids; utils.skill_index matches user_profiles.skill_ids
+    # against internships.skill_ids in memory, so no index on them
+    "ALTER TABLE internships ADD COLUMN IF NOT EXISTS skill_ids integer[]",
+    "DROP INDEX IF EXISTS internships_skill_ids_idx",
+    "ALTER TABLE user_profiles ADD COLUMN IF NOT EXISTS skill_ids integer[]",
+
+    # ---------- saved items: per-user lookups / pages stay in the index ----------
+    """
+    CREATE INDEX IF NOT EXISTS saved_opportunities_user_type_id_idx
+        ON saved_opportunities (user_id, opportunity_type, opportunity_id)
+    """,
+    # /saved lists most recently saved first
+    """
+    ALTER TABLE saved_opportunities
+        ADD COLUMN IF NOT EXISTS created_at timestamptz NOT NULL DEFAULT now()
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS saved_opportunities_user_type_created_idx
+        ON saved_opportunities (user_id, opportunity_type, created_at DESC, opportunity_id DESC)
+    """,
+
+    # ---------- full-text search over title / organization / skills ----------
+    """
+    ALTER TABLE internships
+        ADD COLUMN IF NOT EXISTS search_tsv tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(skills_final, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(organization, '')), 'C')
+        ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS internships_search_tsv_idx
+        ON internships USING gin (search_tsv)
+    """,
+
+    # ---------- trigram indexes for the ILIKE '%...%' filters ----------
+    # pg_trgm ships with Supabase; skip quietly where it is not installed
+    """
+    DO $$
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_trgm not available: %', SQLERRM;
+    END $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+            CREATE INDEX IF NOT EXISTS internships_location_trgm_idx
+                ON internships USING gin (location gin_trgm_ops);
+            CREATE INDEX IF NOT EXISTS internships_source_trgm_idx
+                ON internships USING gin (source gin_trgm_ops);
+        END IF;
+    END $$
+    """,
+]
+
+
+def ensure_schema(conn):
+    cur = conn.cursor()
+    for statement in STATEMENTS:
+        cur.execute(statement)
+    conn.commit()
+    cur.close()
+
+
+def main():
+    conn = get_db()
+    ensure_schema(conn)
+    conn.close()
+    print(f"✅ Applied {len(STATEMENTS)} schema statements")
+
+
+if __name__ == "__main__":
+    main()
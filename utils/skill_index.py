@@ -0,0 +1,248 @@
+import heapq
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from utils.db import get_db
+from utils.catalog import get_catalog_version
+
+# Changed listings are re-read by updated_at; deleted ones only drop out
+# on a full rebuild.
+SKILL_INDEX_REBUILD_SECONDS = float(os.getenv("SKILL_INDEX_REBUILD_SECONDS", "3600"))
+
+
+def normalize_skill(skill):
+    return " ".join(str(skill).lower().split())
+
+
+def normalize_location(location):
+    return " ".join(str(location or "").lower().split())
+
+
+def _contains(sorted_ids, internship_id):
+    i = bisect_left(sorted_ids, internship_id)
+    return i < len(sorted_ids) and sorted_ids[i] == internship_id
+
+
+class _IndexState:
+    """Immutable snapshot; refresh builds a new one and swaps it in."""
+
+    def __init__(self, postings, locations, remote, meta, terms, watermark):
+        self.postings = postings      # skill id -> array of ids (ascending)
+        self.locations = locations    # location -> array of ids (ascending)
+        self.remote = remote          # array of ids whose location is remote*
+        self.meta = meta              # id -> (title, organization, location, created_ts)
+        self.terms = terms            # id -> skill ids it is posted under
+        self.watermark = watermark    # newest internships.updated_at indexed
+
+
+def _empty_state():
+    return _IndexState({}, {}, array("q"), {}, {}, None)
+
+
+def _rewrite(lists, removed, added):
+    """Copy-on-write update of the touched id lists; readers keep the old arrays."""
+    lists = dict(lists)
+    for key in removed.keys() | added.keys():
+        ids = set(lists.get(key, ())) - removed.get(key, set())
+        ids |= added.get(key, set())
+        if ids:
+            lists[key] = array("q", sorted(ids))
+        else:
+            lists.pop(key, None)
+    return lists
+
+
+class SkillIndex:
+    """
+    Per-worker inverted index over internships.skill_ids.
+
+    skill id -> sorted array of internship ids, plus location buckets, so
+    a recommendation is a posting-list intersection / count over integer
+    ids (aliases already resolved by the uploader) instead of a GROUP BY
+    over the whole catalog.
+    """
+
+    def __init__(self):
+        self._state = _empty_state()
+        self._version = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    # ---------- loading ----------
+    def _load(self, since=None):
+        """Listings with updated_at after since; all when None."""
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, title, organization, location,
+                       EXTRACT(EPOCH FROM created_at), updated_at, skill_ids
+                FROM internships
+                WHERE %(since)s::timestamptz IS NULL OR updated_at > %(since)s
+                ORDER BY id
+                """,
+                {"since": since}
+            )
+            rows = cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
+
+        return rows
+
+    def _merge(self, base, rows):
+        """
+        base plus the given listings. A listing already in base (an upsert
+        keeps its id) is first taken out of its old location bucket and
+        posting lists, so changed skills / locations replace the old ones.
+        """
+        meta = dict(base.meta)
+        terms = dict(base.terms)
+        watermark = base.watermark
+
+        old_postings, old_locations, old_remote = {}, {}, set()
+        new_postings, new_locations, new_remote = {}, {}, set()
+
+        for internship_id, title, organization, location, created_ts, updated_at, skill_ids in rows:
+            if internship_id in meta:
+                loc = normalize_location(meta[internship_id][2])
+                old_locations.setdefault(loc, set()).add(internship_id)
+                old_remote.add(internship_id)
+                for skill_id in terms.pop(internship_id, ()):
+                    old_postings.setdefault(skill_id, set()).add(internship_id)
+
+            meta[internship_id] = (title, organization, location, float(created_ts or 0))
+            terms[internship_id] = tuple(sorted(set(skill_ids or ())))
+            for skill_id in terms[internship_id]:
+                new_postings.setdefault(skill_id, set()).add(internship_id)
+            loc = normalize_location(location)
+            new_locations.setdefault(loc, set()).add(internship_id)
+            if loc.startswith("remote"):
+                new_remote.add(internship_id)
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+
+        remote = array("q", sorted(set(base.remote) - old_remote | new_remote))
+
+        return _IndexState(
+            _rewrite(base.postings, old_postings, new_postings),
+            _rewrite(base.locations, old_locations, new_locations),
+            remote if rows else base.remote,
+            meta,
+            terms,
+            watermark,
+        )
+
+    def build(self, version=None):
+        rows = self._load()
+        with self._lock:
+            self._state = self._merge(_empty_state(), rows)
+            self._version = version
+            self._built_at = time.monotonic()
+
+    def refresh(self):
+        """
+        Bring the index up to the current catalog version: listings the
+        uploader inserted or changed since the last refresh (updated_at
+        past the watermark) are re-indexed in place. A full rebuild happens
+        on first use and every SKILL_INDEX_REBUILD_SECONDS.
+        """
+        version = get_catalog_version()
+        if version == self._version:
+            return
+
+        state = self._state
+        if (self._version is None
+                or time.monotonic() - self._built_at > SKILL_INDEX_REBUILD_SECONDS):
+            self.build(version)
+            return
+
+        rows = self._load(state.watermark)
+        with self._lock:
+            self._state = self._merge(state, rows)
+            self._version = version
+
+    # ---------- scoring ----------
+    def top_k(self, skill_ids, location, k=5):
+        """
+        Same ranking as the old SQL: internships in the user's location or
+        remote, ordered by number of matching skills, then newest first.
+        skill_ids: the user's dictionary ids (user_profiles.skill_ids).
+        """
+        state = self._state
+
+        buckets = [state.remote]
+        loc = normalize_location(location)
+        if loc in state.locations and not loc.startswith("remote"):
+            buckets.append(state.locations[loc])
+        candidate_count = sum(len(b) for b in buckets)
+
+        def eligible(internship_id):
+            return any(_contains(b, internship_id) for b in buckets)
+
+        scores = Counter()
+        for skill in set(skill_ids):
+            posting = state.postings.get(skill)
+            if not posting:
+                continue
+
+            if candidate_count < len(posting):
+                # walk the smaller side, binary-search the posting list
+                for bucket in buckets:
+                    for internship_id in bucket:
+                        if _contains(posting, internship_id):
+                            scores[internship_id] += 1
+            else:
+                for internship_id in posting:
+                    if eligible(internship_id):
+                        scores[internship_id] += 1
+
+        def rank(internship_id):
+            return (scores.get(internship_id, 0), state.meta[internship_id][3])
+
+        top = heapq.nlargest(k, scores, key=rank)
+
+        # zero-score listings still fill the list (newest first), like the
+        # LEFT JOIN did
+        if len(top) < k:
+            chosen = set(top)
+            rest = (
+                i for b in buckets for i in b
+                if i not in chosen and i not in scores
+            )
+            top += heapq.nlargest(k - len(top), set(rest), key=rank)
+
+        results = []
+        for internship_id in top:
+            title, organization, location, _ = state.meta[internship_id]
+            results.append({
+                "id": internship_id,
+                "title": title,
+                "organization": organization,
+                "location": location,
+                "match_score": scores.get(internship_id, 0),
+            })
+        return results
+
+    def stats(self):
+        state = self._state
+        return {
+            "version": self._version,
+            "internships": len(state.meta),
+            "skills": len(state.postings),
+            "locations": len(state.locations),
+            "updated_at": state.watermark,
+        }
+
+
+# ---------------- PER-WORKER INDEX ----------------
+_index = SkillIndex()
+
+
+def get_skill_index():
+    _index.refresh()
+    return _index
@@ -1,6 +1,8 @@
 from .base import BaseSkillExtractor
+from .factory import register
 
 #AICTE SKills Extractor
+@register("AICTE")
 class AICTEExtractor(BaseSkillExtractor):
     MAX_SKILLS = 4
 
@@ -8,7 +10,8 @@ class AICTEExtractor(BaseSkillExtractor):
         # ---------- AI / DATA ----------
         "machine learning": ["Python", "Machine Learning"],
         "artificial intelligence": ["Python", "Machine Learning"],
-        "ai ": ["Python", "Machine Learning"],
+        "ai": ["Python", "Machine Learning"],
+        "aiml": ["Python", "Machine Learning"],
         "data science": ["Python", "EDA", "Machine Learning"],
         "data analytics": ["SQL", "Excel", "Data Visualization"],
         "data analyst": ["SQL", "Excel"],
@@ -22,6 +25,7 @@ class AICTEExtractor(BaseSkillExtractor):
         "c++": ["C++"],
         "sql": ["SQL"],
         "react": ["React"],
+        "reactjs": ["React"],
         "node": ["Node.js"],
         "mern": ["MongoDB", "Express", "React", "Node.js"],
 
@@ -38,6 +42,7 @@ class AICTEExtractor(BaseSkillExtractor):
 
         # ---------- CYBER ----------
         "cyber": ["Cybersecurity"],
+        "cybersecurity": ["Cybersecurity"],
         "ethical hacking": ["Cybersecurity", "Networking"],
 
         # ---------- MOBILE ----------
@@ -87,23 +92,5 @@ class AICTEExtractor(BaseSkillExtractor):
     }
     
     def extract(self, title: str, metadata=None):
-
-
         text = title.lower().replace("-", " ").replace("/", " ")
-        # text = re.sub(r"[^\w\s]", " ", text)
-   
-        skills = []
-
-        for keyword, mapped in self.KEYWORD_MAP.items():
-
-            if keyword in text:
-
-                for skill in mapped:
-
-                    if skill not in skills:
-                        skills.append(skill)
-
-                    if len(skills) >= self.MAX_SKILLS:
-                        return skills
-
-        return skills
+        return self.match_keywords(text)
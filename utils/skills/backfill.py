@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import pandas as pd
+from utils.skills.factory import get_extractor, extractor_stats
+from utils.skills.parsing import parse_skill_list
+
+# -------------------------------------------------
+# Derive skills_final for the scraped CSVs in one pass per file:
+#   python -m utils.skills.backfill              fill rows without skills
+#   python -m utils.skills.backfill --recompute  re-derive every row
+# Sources that scrape their own tags (KEEP_SCRAPED_TAGS) only ever get
+# their empty rows filled.
+# -------------------------------------------------
+DATA_FOLDER = "data"
+
+
+def backfill_frame(df, recompute=False):
+    """
+    Fill skills_final in place with extract_many, one call per source.
+    Sources without an extractor are left alone. Returns the number of
+    rows whose skills changed.
+    """
+    # an all-empty column reads back as float NaN
+    df["skills_final"] = (
+        df["skills_final"].astype(object) if "skills_final" in df.columns else None
+    )
+
+    existing = df["skills_final"].map(parse_skill_list)
+    empty = existing.map(len).eq(0)
+    todo = df if recompute else df[empty]
+    if todo.empty:
+        return 0
+
+    changed = 0
+    for source, group in todo.groupby(todo["source"].fillna(""), sort=False):
+        try:
+            extractor = get_extractor(source)
+        except ValueError:
+            print(f"   ⏭️ No extractor for source {source!r}, {len(group)} rows skipped")
+            continue
+        if extractor.KEEP_SCRAPED_TAGS:
+            group = group[empty.loc[group.index]]
+            if group.empty:
+                continue
+
+        skills = extractor.extract_many(
+            group["title"],
+            group["extra_data"] if "extra_data" in group.columns else None,
+        )
+        differs = [new != old for new, old in zip(skills, existing.loc[group.index])]
+        updated = skills[differs]
+        # same repr the scrapers write: "['Python', 'EDA']"
+        df.loc[updated.index, "skills_final"] = updated.map(repr)
+        changed += len(updated)
+
+    return changed
+
+
+def backfill_csv(path, recompute=False):
+    start = time.perf_counter()
+    df = pd.read_csv(path)
+    changed = backfill_frame(df, recompute)
+    if changed:
+        df.to_csv(path, index=False)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ {os.path.basename(path)}: {changed} of {len(df)} rows updated "
+        f"({elapsed:.2f}s, {len(df) / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+    return len(df), changed
+
+
+def main():
+    recompute = "--recompute" in sys.argv[1:]
+    paths = sorted(
+        os.path.join(DATA_FOLDER, f)
+        for f in os.listdir(DATA_FOLDER)
+        if f.endswith(".csv")
+    )
+    if not paths:
+        print("❌ No CSV files found in data/")
+        return
+
+    print(f"🧠 Backfilling skills_final for {len(paths)} CSV files")
+    start = time.perf_counter()
+    rows = changed = 0
+    for path in paths:
+        file_rows, file_changed = backfill_csv(path, recompute)
+        rows += file_rows
+        changed += file_changed
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n📊 {changed} of {rows} rows updated in {elapsed:.2f}s "
+        f"({rows / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+    for source, stats in extractor_stats().items():
+        print(f"   {source}: {stats['hits']} cache hits, {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,41 @@
+import json
+import os
+from functools import lru_cache
+import pandas as pd
+from .dictionary import canonical_skills
+from .matcher import KeywordMatcher
+
+# Distinct (title, metadata) results each source's extractor remembers
+EXTRACTOR_CACHE_SIZE = int(os.getenv("EXTRACTOR_CACHE_SIZE", "50000"))
+
+
+def _as_metadata(value):
+    """extra_data as scraped: a dict, a JSON string, or nothing."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
 class BaseSkillExtractor:
+    # keyword -> skills; subclasses fill these in
+    KEYWORD_MAP: dict[str, list[str]] = {}
+    MAX_SKILLS = 4
+    # metadata fields extract() reads; rows that agree on title and these
+    # share one cached result
+    METADATA_KEYS: tuple[str, ...] = ()
+    # the source scrapes its own skill tags: only derive skills for rows
+    # that came without any
+    KEEP_SCRAPED_TAGS = False
+
+    def __init__(self):
+        self._cached = lru_cache(maxsize=EXTRACTOR_CACHE_SIZE)(self._extract_key)
+
     def extract(self, title: str, metadata: dict | None = None) -> list[str]:
         """
         Base contract for all sources.
@@ -7,3 +44,80 @@ class BaseSkillExtractor:
         without breaking the interface.
         """
         raise NotImplementedError
+
+    # ---------------- CACHED / BATCH ----------------
+    def _extract_key(self, title, signals):
+        return tuple(self.extract(title, dict(zip(self.METADATA_KEYS, signals))))
+
+    def extract_cached(self, title, metadata=None) -> list[str]:
+        """
+        extract() through this extractor's LRU, keyed on the normalized
+        title and the METADATA_KEYS values.
+        """
+        title = " ".join(title.lower().split()) if isinstance(title, str) else ""
+        if not title:
+            return []
+        metadata = _as_metadata(metadata)
+        signals = tuple(str(metadata.get(k) or "") for k in self.METADATA_KEYS)
+        return list(self._cached(title, signals))
+
+    def cache_stats(self):
+        info = self._cached.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    def extract_many(self, titles, metadata=None):
+        """
+        extract() over many rows: titles is a pandas Series or any iterable,
+        metadata None, one dict for every row, or an aligned Series /
+        iterable of dicts or JSON strings. Repeated (title, METADATA_KEYS)
+        rows are served from the LRU. Returns a list of skill lists aligned
+        with titles (a Series with the same index for a Series).
+        """
+        index = titles.index if isinstance(titles, pd.Series) else None
+        titles = list(titles)
+
+        if metadata is None or isinstance(metadata, dict):
+            rows = [metadata or {}] * len(titles)
+        else:
+            rows = list(metadata)
+            if len(rows) != len(titles):
+                raise ValueError("metadata is not aligned with titles")
+
+        results = [self.extract_cached(title, row) for title, row in zip(titles, rows)]
+
+        if index is not None:
+            return pd.Series(results, index=index, dtype=object)
+        return results
+
+    @classmethod
+    def matcher(cls) -> KeywordMatcher:
+        """The class's KEYWORD_MAP compiled once (per class, not per instance)."""
+        compiled = cls.__dict__.get("_matcher")
+        if compiled is None:
+            compiled = KeywordMatcher(cls.KEYWORD_MAP)
+            cls._matcher = compiled
+        return compiled
+
+    def match_keywords(self, text: str) -> list[str]:
+        """
+        Skills mapped from every KEYWORD_MAP keyword found in text (whole
+        words, one pass), in KEYWORD_MAP order, capped at MAX_SKILLS.
+        """
+        mapped = list(self.KEYWORD_MAP.values())
+        skills = []
+        for index in self.matcher().find(text):
+            for skill in mapped[index]:
+                if skill not in skills:
+                    skills.append(skill)
+                if len(skills) >= self.MAX_SKILLS:
+                    return self.finalize(skills)
+        return self.finalize(skills)
+
+    def finalize(self, skills: list[str]) -> list[str]:
+        """Canonical dictionary names (aliases resolved), de-duplicated."""
+        return canonical_skills(skills)
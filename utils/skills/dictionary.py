@@ -0,0 +1,294 @@
+import difflib
+import os
+import re
+from functools import lru_cache
+from psycopg2.extras import execute_values
+
+# -------------------------------------------------
+# Canonical skills. The `skills` table gives every skill an integer id,
+# `skill_aliases` maps variant spellings onto those ids. SEED_ALIASES is the
+# built-in part of the alias map: usable offline (scrapers, validators) and
+# copied into the tables by the uploader, together with every raw tag the
+# canonicalizer below mapped onto a different skill. Those are stored as
+# derived aliases: the next upload rewrites them when the rules change.
+# -------------------------------------------------
+SEED_ALIASES = {
+    # AI / data
+    "ml": "Machine Learning",
+    "machine-learning": "Machine Learning",
+    "dl": "Deep Learning",
+    "ai": "Artificial Intelligence",
+    "nlp": "Natural Language Processing",
+    "genai": "Generative AI",
+    "gen ai": "Generative AI",
+    "exploratory data analysis": "EDA",
+    "data viz": "Data Visualization",
+    "powerbi": "Power BI",
+    "ms power bi": "Power BI",
+    "ms excel": "Excel",
+    "microsoft excel": "Excel",
+    "advanced excel": "Excel",
+    # programming
+    "py": "Python",
+    "python3": "Python",
+    "js": "JavaScript",
+    "javascript (es6)": "JavaScript",
+    "ts": "TypeScript",
+    "c plus plus": "C++",
+    "cpp": "C++",
+    "golang": "Go",
+    "postgres": "PostgreSQL",
+    "mongo": "MongoDB",
+    # web / mobile
+    "reactjs": "React",
+    "react.js": "React",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "node js": "Node.js",
+    "expressjs": "Express",
+    "express.js": "Express",
+    "rest api": "APIs",
+    "rest apis": "APIs",
+    "html5": "HTML",
+    "css3": "CSS",
+    "ui/ux": "UI/UX Design",
+    "ui ux": "UI/UX Design",
+    "ux design": "UI/UX Design",
+    "android development": "Android",
+    # ops / cloud
+    "ci cd": "CI/CD",
+    "aws": "Amazon Web Services (AWS)",
+    "amazon web services": "Amazon Web Services (AWS)",
+    "cloud": "Cloud Computing",
+    "cyber security": "Cybersecurity",
+    # business / writing
+    "search engine optimization": "SEO",
+    "search engine optimization (seo)": "SEO",
+    "social media": "Social Media Marketing",
+    "content writer": "Content Writing",
+    "spoken english": "English Proficiency (Spoken)",
+    "ms office": "MS-Office",
+    "microsoft office": "MS-Office",
+}
+
+
+# Words that qualify a skill without naming a different one ("C++
+# Programming", "Generative AI Tools"); dropped only when what is left is
+# a known skill, so "Game Development" stays what it is
+QUALIFIER_WORDS = frozenset({
+    "advanced", "basic", "basics", "concepts", "developer", "development",
+    "framework", "fundamentals", "language", "library", "programming",
+    "skills", "tool", "tools",
+})
+# difflib ratio a near-miss spelling needs ("Javascrpt", "Data Visualisation")
+FUZZY_CUTOFF = 0.9
+FUZZY_MIN_LENGTH = 6
+# distinct raw tags whose canonical form is remembered
+CANONICAL_CACHE_SIZE = int(os.getenv("CANONICAL_CACHE_SIZE", "100000"))
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+PAREN_RE = re.compile(r"\(([^)]*)\)")
+
+
+def skill_key(name):
+    """Case / whitespace-insensitive lookup key ('Machine  learning' → 'machine learning')."""
+    return " ".join(str(name).lower().split())
+
+
+def _tokens(text):
+    """'UI & UX Design' → ['ui', 'ux', 'design']; keeps 'c++', 'c#', 'node.js'."""
+    return TOKEN_RE.findall(text.lower())
+
+
+_SEED_KEYS = {skill_key(alias): canonical for alias, canonical in SEED_ALIASES.items()}
+
+
+class _Vocabulary:
+    """
+    The canonical names (seed alias targets and every registered
+    extractor's KEYWORD_MAP output) indexed by token string and by sorted
+    tokens, plus the seed aliases by token string.
+    """
+
+    def __init__(self, names):
+        self.by_tokens = {}
+        self.by_token_set = {}
+        for name in sorted(names):
+            tokens = _tokens(name)
+            self.by_tokens.setdefault(" ".join(tokens), name)
+            self.by_token_set.setdefault(" ".join(sorted(tokens)), name)
+        for alias, canonical in SEED_ALIASES.items():
+            self.by_tokens[" ".join(_tokens(alias))] = canonical
+        self.keys = list(self.by_tokens)
+
+    def lookup(self, tokens):
+        if not tokens:
+            return None
+        return (
+            self.by_tokens.get(" ".join(tokens))
+            or self.by_token_set.get(" ".join(sorted(tokens)))
+        )
+
+
+_vocabulary = None
+
+
+def _get_vocabulary():
+    # built on first use: the extractor modules import this one
+    global _vocabulary
+    if _vocabulary is None:
+        from .factory import extractor_classes
+
+        names = set(SEED_ALIASES.values())
+        for cls in extractor_classes():
+            for mapped in cls.KEYWORD_MAP.values():
+                names.update(mapped)
+        _vocabulary = _Vocabulary(names)
+    return _vocabulary
+
+
+def _candidates(key):
+    """Token lists a raw tag may be known by, most literal first."""
+    tokens = _tokens(key)
+    yield tokens
+    yield ["".join(tokens)]                                  # "HTML 5" → html5
+    if tokens and tokens[-1].endswith("s") and len(tokens[-1]) > 3:
+        yield tokens[:-1] + [tokens[-1][:-1]]                # "Databases"
+    outside = _tokens(PAREN_RE.sub(" ", key))
+    if outside != tokens:
+        yield outside                                        # "... (NLP)"
+        initials = "".join(t[0] for t in outside)
+        for inner in PAREN_RE.findall(key):
+            if _tokens(inner) == [initials]:
+                yield [initials]                             # "Internet of Things (IoT)"
+    for words in (tokens, outside):
+        kept = [t for t in words if t not in QUALIFIER_WORDS]
+        if kept != words:
+            yield kept                                       # "C++ Programming"
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_skill(name):
+    """
+    One vocabulary for every source's skills:
+    'ml' → 'Machine Learning', 'Natural Language Processing (NLP)' →
+    'Natural Language Processing', 'C++ Programming' → 'C++',
+    'Javascrpt' → 'JavaScript'. Tags that match nothing keep their
+    spelling (whitespace tidied). Cached per raw tag.
+    """
+    cleaned = " ".join(str(name).split())
+    key = skill_key(cleaned)
+    if not key:
+        return cleaned
+
+    seed = _SEED_KEYS.get(key)
+    if seed is not None:
+        return seed
+
+    vocabulary = _get_vocabulary()
+    for tokens in _candidates(key):
+        canonical = vocabulary.lookup(tokens)
+        if canonical is not None:
+            return canonical
+
+    joined = " ".join(_tokens(key))
+    if len(joined) >= FUZZY_MIN_LENGTH:
+        close = difflib.get_close_matches(joined, vocabulary.keys, n=1, cutoff=FUZZY_CUTOFF)
+        if close:
+            return vocabulary.by_tokens[close[0]]
+
+    return cleaned
+
+
+def canonicalize(skills):
+    """
+    canonical_skill over a whole pandas Series (an upload batch): each
+    distinct raw tag is resolved once, then mapped back onto the rows.
+    """
+    distinct = skills.drop_duplicates()
+    return skills.map(dict(zip(distinct, distinct.map(canonical_skill))))
+
+
+def canonical_skills(names):
+    """Canonical names, de-duplicated case-insensitively, order kept."""
+    seen = set()
+    result = []
+    for name in names:
+        skill = canonical_skill(name)
+        key = skill_key(skill)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(skill)
+    return result
+
+
+def sync_seed(cur):
+    """
+    Copy SEED_ALIASES (and their canonical skills) into the tables. Seed
+    rows are the only non-derived aliases: one taken out of SEED_ALIASES
+    becomes derived, so uploads may remap it. The caller commits.
+    """
+    canonical = sorted(set(SEED_ALIASES.values()))
+    execute_values(
+        cur,
+        "INSERT INTO skills (name, key) VALUES %s ON CONFLICT (key) DO NOTHING",
+        [(name, skill_key(name)) for name in canonical],
+    )
+    seed = [(skill_key(alias), skill_key(name)) for alias, name in SEED_ALIASES.items()]
+    execute_values(
+        cur,
+        """
+        INSERT INTO skill_aliases (alias, skill_id, derived)
+        SELECT v.alias, s.id, false
+        FROM (VALUES %s) AS v(alias, key)
+        JOIN skills s ON s.key = v.key
+        ON CONFLICT (alias) DO UPDATE
+        SET skill_id = EXCLUDED.skill_id,
+            derived = false
+        WHERE (skill_aliases.skill_id, skill_aliases.derived)
+              IS DISTINCT FROM (EXCLUDED.skill_id, false)
+        """,
+        seed,
+    )
+    cur.execute(
+        "UPDATE skill_aliases SET derived = true WHERE NOT derived AND alias <> ALL(%s)",
+        ([alias for alias, _ in seed],)
+    )
+
+
+def sync_user_skill_ids(cur, user_id=None):
+    """
+    Recompute user_profiles.skill_ids (sorted dictionary ids of the user's
+    skills; a skill the dictionary does not know has none) for one user or
+    for everyone, e.g. after an upload added skills or aliases. Only rows
+    whose array changed are written. Returns that count; the caller commits.
+    """
+    cur.execute(
+        """
+        WITH wanted AS (
+            SELECT p.user_id,
+                   ARRAY(
+                       SELECT DISTINCT coalesce(d.id, a.skill_id)
+                       FROM user_skills us
+                       CROSS JOIN LATERAL (
+                           SELECT btrim(lower(regexp_replace(us.skill, '\\s+', ' ', 'g'))) AS key
+                       ) k
+                       LEFT JOIN skills d ON d.key = k.key
+                       LEFT JOIN skill_aliases a ON a.alias = k.key
+                       WHERE us.user_id = p.user_id
+                         AND coalesce(d.id, a.skill_id) IS NOT NULL
+                       ORDER BY 1
+                   ) AS skill_ids
+            FROM user_profiles p
+            WHERE %(user_id)s IS NULL OR p.user_id = %(user_id)s
+        )
+        UPDATE user_profiles p
+        SET skill_ids = w.skill_ids
+        FROM wanted w
+        WHERE p.user_id = w.user_id
+          AND p.skill_ids IS DISTINCT FROM w.skill_ids
+        """,
+        {"user_id": user_id},
+    )
+    return cur.rowcount
+
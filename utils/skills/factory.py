@@ -1,24 +1,76 @@
-from .skill_india import SkillIndiaExtractor
-from .aicte_skills import AICTEExtractor
-# If you have an Internshala extractor, import it here too
-# from .internshala_skills import InternshalaExtractor 
+import os
+import threading
+
+# -------------------------------------------------
+# Extractor registry. Each source module registers its class:
+#
+#     @register("AICTE")
+#     class AICTEExtractor(BaseSkillExtractor): ...
+#
+# and get_extractor() hands out one pre-compiled instance per source, so
+# its keyword automaton and result cache are shared by every caller.
+# -------------------------------------------------
+_registry = {}     # source -> extractor class
+_instances = {}    # source -> extractor instance
+_lock = threading.Lock()
+
+# Sources whose keyword extractor is combined with the trained tagger
+# (utils.skills.tagger) once a model has been saved. Opt-in, e.g.
+# SKILL_TAGGER_SOURCES=Internshala: on titles it has not seen the model
+# is still weak (see python -m utils.skills.tagger)
+SKILL_TAGGER_SOURCES = {
+    s.strip()
+    for s in os.getenv("SKILL_TAGGER_SOURCES", "").split(",")
+    if s.strip()
+}
+
+
+def register(*sources):
+    """Class decorator: serve this extractor for the given source names."""
+    def decorator(cls):
+        for source in sources:
+            _registry[source.strip()] = cls
+        return cls
+    return decorator
+
 
 def get_extractor(source: str):
     """
-    Returns the correct skill extractor class based on the source name.
+    Returns the shared skill extractor for a source name.
     """
     # Normalize the source string (remove extra spaces)
     source = source.strip()
 
-    if source == "Skill India":
-        return SkillIndiaExtractor()
+    extractor = _instances.get(source)
+    if extractor is None:
+        cls = _registry.get(source)
+        if cls is None:
+            # If no match is found, raise an error
+            raise ValueError(f"No extractor configured for source: {source}")
+        with _lock:
+            extractor = _instances.get(source)
+            if extractor is None:
+                cls.matcher()  # compile the keyword automaton up front
+                extractor = cls()
+                if source in SKILL_TAGGER_SOURCES:
+                    from .tagger import with_tagger
+                    extractor = with_tagger(extractor)
+                _instances[source] = extractor
+    return extractor
+
+
+def registered_sources():
+    return sorted(_registry)
+
+
+def extractor_classes():
+    return list(dict.fromkeys(_registry.values()))
+
+
+def extractor_stats():
+    """Result-cache counters of every extractor handed out so far."""
+    return {source: extractor.cache_stats() for source, extractor in _instances.items()}
 
-    elif source == "AICTE":
-        return AICTEExtractor()
-    
-    # elif source == "Internshala":
-    #     return InternshalaExtractor()
 
-    else:
-        # If no match is found, raise an error
-        raise ValueError(f"No extractor configured for source: {source}")
\ No newline at end of file
+# Importing a source module registers its extractor
+from . import aicte_skills, skill_india, internshala_skills, remoteok_skills  # noqa: E402,F401
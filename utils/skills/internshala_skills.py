@@ -0,0 +1,89 @@
+from .base import BaseSkillExtractor
+from .factory import register
+
+
+# Internshala Skills Extractor
+# Listings normally carry their own skill tags; this fills in the ones
+# that come without any, from the title (mostly category names such as
+# "Full Stack Development" or "QA Testing").
+@register("Internshala")
+class InternshalaExtractor(BaseSkillExtractor):
+    MAX_SKILLS = 4
+    KEEP_SCRAPED_TAGS = True
+
+    KEYWORD_MAP = {
+        # ---------- AI / DATA ----------
+        "artificial intelligence": ["Python", "Machine Learning"],
+        "ai": ["Python", "Machine Learning"],
+        "ai agent": ["Python", "Generative AI"],
+        "machine learning": ["Python", "Machine Learning"],
+        "ml": ["Python", "Machine Learning"],
+        "deep learning": ["Python", "Deep Learning"],
+        "computer vision": ["Python", "Computer Vision"],
+        "nlp": ["Python", "Natural Language Processing"],
+        "natural language processing": ["Python", "Natural Language Processing"],
+        "data science": ["Python", "EDA", "Machine Learning"],
+        "data analytics": ["SQL", "Excel", "Data Visualization"],
+        "data analyst": ["SQL", "Excel"],
+        "power bi": ["Power BI", "Data Visualization"],
+
+        # ---------- WEB ----------
+        "full stack": ["JavaScript", "React", "Node.js", "APIs"],
+        "mern": ["MongoDB", "Express", "React", "Node.js"],
+        "front end": ["HTML", "CSS", "JavaScript", "React"],
+        "frontend": ["HTML", "CSS", "JavaScript", "React"],
+        "back end": ["APIs", "Databases"],
+        "backend": ["APIs", "Databases"],
+        "web development": ["HTML", "CSS", "JavaScript"],
+        "react": ["React"],
+        "reactjs": ["React"],
+        "react js": ["React"],
+        "node.js": ["Node.js"],
+        "wordpress": ["WordPress"],
+        "php": ["PHP"],
+
+        # ---------- PROGRAMMING ----------
+        "python": ["Python"],
+        "java": ["Java"],
+        "c++": ["C++"],
+        "software development": ["Programming", "Git"],
+        "software engineering": ["Programming", "Git"],
+
+        # ---------- MOBILE / GAMES ----------
+        "flutter": ["Flutter", "Dart"],
+        "react native": ["React Native", "JavaScript"],
+        "android": ["Android"],
+        "ios": ["iOS", "Swift"],
+        "mobile app": ["Mobile Development"],
+        "app development": ["Mobile Development"],
+        "game development": ["Unity", "C#"],
+        "game designer": ["Game Design"],
+
+        # ---------- TESTING ----------
+        "software testing": ["Manual Testing", "Test Cases"],
+        "qa": ["Manual Testing", "Test Cases"],
+        "quality analyst": ["Manual Testing", "Test Cases"],
+        "automation testing": ["Selenium", "Automation Testing"],
+        "automation": ["Automation Testing"],
+
+        # ---------- CLOUD / OPS ----------
+        "cloud": ["Cloud Computing"],
+        "aws": ["Amazon Web Services (AWS)"],
+        "devops": ["Docker", "CI/CD"],
+        "network": ["Networking"],
+        "cyber security": ["Cybersecurity"],
+        "cybersecurity": ["Cybersecurity"],
+
+        # ---------- OTHER ----------
+        "graphic": ["Graphic Design"],
+        "video": ["Video Editing"],
+        "digital marketing": ["Digital Marketing", "SEO"],
+        "marketing": ["Digital Marketing"],
+        "content": ["Content Writing"],
+        "sales": ["Sales", "Communication"],
+        "robotics": ["Robotics"],
+    }
+
+    def extract(self, title: str, metadata: dict | None = None) -> list[str]:
+        text = title.lower().replace("-", " ").replace("/", " ")
+        return self.match_keywords(text)
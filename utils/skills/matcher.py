@@ -0,0 +1,106 @@
+from collections import deque
+
+# Endings a keyword may carry and still be a hit: "account" finds
+# "accounts" / "accountant" / "accountancy", "robot" finds "robotics",
+# "human resource" finds "human resources". Only for keywords of
+# INFLECT_MIN_LENGTH+ letters, so "go" does not find "goes" and "ai" does
+# not find "aids"; "java" still does not find "javascript".
+INFLECTIONS = ("s", "es", "ing", "ed", "er", "ers", "ant", "ants", "ancy", "ics")
+INFLECT_MIN_LENGTH = 4
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+def _inflected(text, start, keyword):
+    """Does text[start:] continue keyword with one of INFLECTIONS, then a word break?"""
+    if len(keyword) < INFLECT_MIN_LENGTH or not keyword[-1].isalpha():
+        return False
+    for ending in INFLECTIONS:
+        stop = start + len(ending)
+        if text.startswith(ending, start) and (stop == len(text) or not _is_word_char(text[stop])):
+            return True
+    return False
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    find() scans the text once, whatever the number of keywords, and
+    reports the keywords that occur as whole words ("ai" does not match
+    "maintain", "r" does not match "for"), or followed by one of
+    INFLECTIONS. Keywords are lower-cased and stripped; the text is
+    expected lower-case already.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = [" ".join(k.lower().split()) for k in keywords]
+
+        self._goto = [{}]     # trie: state -> {char: state}
+        self._fail = [0]
+        self._out = [[]]      # state -> indexes of keywords ending here
+
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # breadth-first: a state's fail link is the longest proper suffix
+        # that is also in the trie; outputs are inherited along it, and the
+        # fail state's transitions are folded in (a DFA), so scanning is one
+        # dict lookup per character with no fail-chain walking
+        order = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._delta = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        for state in order:
+            delta = dict(self._delta[self._fail[state]])
+            delta.update(self._goto[state])
+            self._delta[state] = delta
+
+    def find(self, text):
+        """Sorted indexes (into keywords) of every whole-word (or inflected) hit in text."""
+        delta, out, keywords = self._delta, self._out, self.keywords
+        size = len(text)
+        hits = set()
+        state = 0
+
+        for end, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for index in out[state]:
+                if index in hits:
+                    continue
+                start = end - len(keywords[index]) + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if (end + 1 < size and _is_word_char(text[end + 1])
+                        and not _inflected(text, end + 1, keywords[index])):
+                    continue
+                hits.add(index)
+
+        return sorted(hits)
+
+    def __len__(self):
+        return len(self.keywords)
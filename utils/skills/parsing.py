@@ -0,0 +1,38 @@
+import ast
+import math
+
+
+def parse_skill_list(value):
+    """
+    skills_final comes back from the CSVs / DB as a Python-repr string
+    ("['Python', 'EDA']"), but may also be a real list, empty or NaN.
+    Always returns a list of non-empty, stripped strings.
+    """
+    if value is None:
+        return []
+
+    if isinstance(value, float) and math.isnan(value):
+        return []
+
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        if text.startswith("[") or text.startswith("("):
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                value = text.strip("[]()").split(",")
+        elif text.startswith("{") and text.endswith("}"):
+            # Postgres text[] literal: {Python,"Machine Learning"}
+            value = [v.strip().strip('"') for v in text[1:-1].split(",")]
+        else:
+            value = text.split(",")
+
+    skills = []
+    for skill in value:
+        if isinstance(skill, str):
+            skill = skill.strip().strip("'\"").strip()
+            if skill:
+                skills.append(skill)
+    return skills
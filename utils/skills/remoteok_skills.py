@@ -0,0 +1,90 @@
+from .base import BaseSkillExtractor
+from .factory import register
+
+
+# RemoteOK Skills Extractor
+# RemoteOK rows are full-time remote jobs with no skill tags scraped;
+# titles name a role ("Senior Backend Engineer") and often a stack.
+@register("RemoteOK")
+class RemoteOKExtractor(BaseSkillExtractor):
+    MAX_SKILLS = 4
+
+    KEYWORD_MAP = {
+        # ---------- STACKS NAMED IN THE TITLE ----------
+        "python": ["Python"],
+        "java": ["Java"],
+        "javascript": ["JavaScript"],
+        "typescript": ["TypeScript"],
+        "golang": ["Go"],
+        "rust": ["Rust"],
+        "ruby": ["Ruby"],
+        "rails": ["Ruby on Rails"],
+        "php": ["PHP"],
+        "kotlin": ["Kotlin"],
+        "swift": ["Swift"],
+        "react": ["React"],
+        "node": ["Node.js"],
+        "salesforce": ["Salesforce"],
+        "kubernetes": ["Kubernetes", "Docker"],
+        "aws": ["Amazon Web Services (AWS)"],
+
+        # ---------- ENGINEERING ROLES ----------
+        "machine learning": ["Python", "Machine Learning"],
+        "ai": ["Python", "Machine Learning"],
+        "data scientist": ["Python", "Machine Learning", "SQL"],
+        "data engineer": ["Python", "SQL", "Data Pipelines"],
+        "data analyst": ["SQL", "Excel", "Data Visualization"],
+        "analytics": ["SQL", "Data Visualization"],
+        "full stack": ["JavaScript", "React", "Node.js", "APIs"],
+        "frontend": ["HTML", "CSS", "JavaScript", "React"],
+        "front end": ["HTML", "CSS", "JavaScript", "React"],
+        "backend": ["APIs", "Databases"],
+        "back end": ["APIs", "Databases"],
+        "devops": ["Docker", "CI/CD"],
+        "site reliability": ["Linux", "Kubernetes", "Cloud Computing"],
+        "infrastructure": ["Cloud Computing", "Linux"],
+        "platform engineer": ["Cloud Computing", "Kubernetes"],
+        "security": ["Cybersecurity"],
+        "cloud": ["Cloud Computing"],
+        "ios": ["iOS", "Swift"],
+        "android": ["Android", "Kotlin"],
+        "mobile": ["Mobile Development"],
+        "qa": ["Manual Testing", "Automation Testing"],
+        "software engineer": ["Programming", "Git"],
+        "solutions engineer": ["APIs", "Communication"],
+        "support engineer": ["Technical Support", "Communication"],
+
+        # ---------- DESIGN / PRODUCT ----------
+        "product designer": ["UI/UX Design", "Figma"],
+        "ux": ["UI/UX Design", "Figma"],
+        "designer": ["Graphic Design"],
+        "product manager": ["Product Management"],
+        "product owner": ["Product Management", "Agile"],
+        "project manager": ["Project Management"],
+
+        # ---------- BUSINESS ----------
+        "customer success": ["Customer Success", "Communication"],
+        "customer support": ["Customer Support", "Communication"],
+        "customer service": ["Customer Support", "Communication"],
+        "technical support": ["Technical Support", "Communication"],
+        "account executive": ["Sales", "Communication"],
+        "account manager": ["Account Management", "Communication"],
+        "business development": ["Sales", "Communication"],
+        "sales": ["Sales", "Communication"],
+        "sdr": ["Sales", "Communication"],
+        "marketing": ["Digital Marketing"],
+        "social media": ["Social Media Marketing"],
+        "seo": ["SEO"],
+        "content": ["Content Writing"],
+        "technical writer": ["Technical Writing"],
+        "writer": ["Content Writing"],
+        "video editor": ["Video Editing"],
+        "finance": ["Financial Analysis", "Excel"],
+        "accountant": ["Accounting"],
+        "recruiter": ["Recruitment"],
+        "virtual assistant": ["Communication", "MS-Office"],
+    }
+
+    def extract(self, title: str, metadata: dict | None = None) -> list[str]:
+        text = title.lower().replace("-", " ").replace("/", " ")
+        return self.match_keywords(text)
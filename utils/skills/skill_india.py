@@ -1,10 +1,13 @@
 from .base import BaseSkillExtractor
+from .factory import register
 
 #Skill India SKills Extractor
+@register("Skill India")
 class SkillIndiaExtractor(BaseSkillExtractor):
 
     
     MAX_SKILLS = 4
+    METADATA_KEYS = ("sector",)
 
     KEYWORD_MAP = {
         # AI / DATA
@@ -12,11 +15,12 @@ class SkillIndiaExtractor(BaseSkillExtractor):
         "data science": ["Python", "Machine Learning", "EDA"],
         "machine learning": ["Python", "Machine Learning"],
         "ai": ["Python", "Machine Learning"],
+        "aiml": ["Python", "Machine Learning"],
         "analytics": ["Excel", "SQL"],
         "power bi": ["Power BI", "Data Visualization"],
         "tableau": ["Tableau", "Data Visualization"],
         "excel": ["Excel"],
-        "r ": ["R"],
+        "r": ["R"],
 
         # MARKETING
         "digital marketing": ["SEO", "Social Media", "Marketing Analytics"],
@@ -29,6 +33,7 @@ class SkillIndiaExtractor(BaseSkillExtractor):
         "tally": ["Tally", "Accounting"],
         "stock": ["Stock Market"],
         "tax": ["Taxation"],
+        "taxation": ["Taxation"],
         "account": ["Accounting"],
 
         # ERP
@@ -40,6 +45,7 @@ class SkillIndiaExtractor(BaseSkillExtractor):
         # WRITING
         "content": ["Content Writing","SEO"],
         "writing": ["Writing"],
+        "copywriting": ["Writing"],
         "technical writing": ["Technical Writing"],
 
         # HR
@@ -76,22 +82,4 @@ class SkillIndiaExtractor(BaseSkillExtractor):
 
         # combine signals
         text = f"{title} {sector}".lower().replace("-"," ")
-
-        skills = []
-
-        for keyword, mapped in self.KEYWORD_MAP.items():
-
-            if keyword in text:
-
-                for skill in mapped:
-                    if skill not in skills:
-                        skills.append(skill)
-
-                    #  STOP when max reached
-                    if len(skills) >= self.MAX_SKILLS:
-                        return skills
-
-        return skills
-
-
-
+        return self.match_keywords(text)
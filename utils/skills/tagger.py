@@ -0,0 +1,260 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.preprocessing import MultiLabelBinarizer
+from .base import BaseSkillExtractor
+from .dictionary import canonical_skills
+from .parsing import parse_skill_list
+
+# -------------------------------------------------
+# Multi-label skill tagger: title → skills, learned from the human-tagged
+# Internshala listings. Trained offline with
+#   python -m utils.skills.tagger
+# and loaded memory-mapped, so every worker on a host shares one copy of
+# the weights through the page cache. Only used for the sources listed in
+# SKILL_TAGGER_SOURCES (utils.skills.factory).
+# -------------------------------------------------
+# directory: weights.npy, intercepts.npy, model.json
+SKILL_TAGGER_PATH = os.getenv("SKILL_TAGGER_PATH", "models/skill_tagger")
+# "fallback": the model only answers when the keyword map finds nothing;
+# "merge": keyword skills first, model fills the rest
+SKILL_TAGGER_MODE = os.getenv("SKILL_TAGGER_MODE", "fallback")
+# probability a label needs; main() picks it on held-out titles and saves
+# it with the model, this overrides it when set
+SKILL_TAGGER_THRESHOLD = os.getenv("SKILL_TAGGER_THRESHOLD")
+THRESHOLDS = (0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4, 0.5, 0.6, 0.7)
+DEFAULT_THRESHOLD = 0.25    # models saved without one
+
+TRAINING_CSV = os.path.join("data", "internshala_inp.csv")
+MIN_LABEL_EXAMPLES = 10     # rarer tags are not learned
+N_FEATURES = 2 ** 16        # hashed title n-grams; weights are labels × this
+VECTORIZER = {
+    "n_features": N_FEATURES,
+    "token_pattern": r"[a-z0-9+#]+",
+    "ngram_range": (1, 2),
+    "alternate_sign": False,
+}
+
+
+class SkillTagger:
+    """
+    The persisted model is plain data, nothing is unpickled: weights
+    (float32, labels × N_FEATURES) and intercepts as .npy files, label
+    names and the HashingVectorizer settings (the vectorizer is
+    stateless) as JSON. Loaded with mmap_mode="r", weights stay a
+    read-only np.memmap.
+    """
+
+    def __init__(self, model, threshold=SKILL_TAGGER_THRESHOLD):
+        self.labels = list(model["labels"])
+        self.weights = model["weights"]
+        self.intercepts = model["intercepts"]
+        if threshold is None:
+            threshold = model.get("threshold", DEFAULT_THRESHOLD)
+        self.threshold = float(threshold)
+        self.vectorizer = HashingVectorizer(**model["vectorizer"])
+
+    @classmethod
+    def load(cls, path=SKILL_TAGGER_PATH):
+        with open(os.path.join(path, "model.json")) as f:
+            meta = json.load(f)
+        meta["vectorizer"]["ngram_range"] = tuple(meta["vectorizer"]["ngram_range"])
+        return cls({
+            "labels": meta["labels"],
+            "vectorizer": meta["vectorizer"],
+            "threshold": meta.get("threshold", DEFAULT_THRESHOLD),
+            "weights": np.load(os.path.join(path, "weights.npy"), mmap_mode="r", allow_pickle=False),
+            "intercepts": np.load(os.path.join(path, "intercepts.npy"), allow_pickle=False),
+        })
+
+    def predict_proba(self, titles):
+        """(len(titles), len(labels)) probabilities, one sparse × dense product."""
+        features = self.vectorizer.transform(titles)
+        scores = features @ self.weights.T + self.intercepts
+        return 1.0 / (1.0 + np.exp(-np.asarray(scores)))
+
+    def predict(self, titles, limit=None):
+        """Labels above the threshold for each title, most likely first."""
+        titles = list(titles)
+        if not titles:
+            return []
+        proba = self.predict_proba(titles)
+        order = np.argsort(-proba, axis=1)
+        results = []
+        for row, ranked in zip(proba, order):
+            picked = [self.labels[j] for j in ranked[:limit] if row[j] >= self.threshold]
+            results.append(picked)
+        return results
+
+
+def save(model, path=SKILL_TAGGER_PATH):
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "weights.npy"), model["weights"], allow_pickle=False)
+    np.save(os.path.join(path, "intercepts.npy"), model["intercepts"], allow_pickle=False)
+    with open(os.path.join(path, "model.json"), "w") as f:
+        json.dump(
+            {
+                "labels": list(model["labels"]),
+                "vectorizer": model["vectorizer"],
+                "threshold": model["threshold"],
+            },
+            f,
+            indent=1,
+        )
+
+
+class TaggerExtractor(BaseSkillExtractor):
+    """
+    A source's keyword extractor plus the tagger. Keyword hits come first
+    (exact, cheap); the model adds what the title implies without naming
+    it, up to the source's MAX_SKILLS. Inference runs once per batch over
+    its distinct titles.
+    """
+
+    def __init__(self, keywords, tagger, mode=SKILL_TAGGER_MODE):
+        super().__init__()
+        self.keywords = keywords
+        self.tagger = tagger
+        self.mode = mode
+        self.MAX_SKILLS = keywords.MAX_SKILLS
+        self.METADATA_KEYS = keywords.METADATA_KEYS
+        self.KEEP_SCRAPED_TAGS = keywords.KEEP_SCRAPED_TAGS
+
+    def extract(self, title: str, metadata: dict | None = None) -> list[str]:
+        return self.extract_many([title], [metadata or {}])[0]
+
+    def extract_many(self, titles, metadata=None):
+        index = titles.index if isinstance(titles, pd.Series) else None
+        titles = list(titles)
+        matched = list(self.keywords.extract_many(titles, metadata))
+
+        wanted = {
+            t for t, skills in zip(titles, matched)
+            if isinstance(t, str) and t.strip()
+            and (self.mode == "merge" or not skills)
+        }
+        wanted = sorted(wanted)
+        predicted = dict(zip(wanted, self.tagger.predict(wanted, self.MAX_SKILLS)))
+
+        results = []
+        for title, skills in zip(titles, matched):
+            extra = predicted.get(title, []) if isinstance(title, str) else []
+            results.append(self.finalize(skills + extra)[:self.MAX_SKILLS])
+
+        if index is not None:
+            return pd.Series(results, index=index, dtype=object)
+        return results
+
+    def cache_stats(self):
+        return self.keywords.cache_stats()
+
+
+# ---------------- PER-PROCESS MODEL ----------------
+_tagger = None
+_tagger_loaded = False
+
+
+def get_tagger():
+    """The saved model, or None when it has not been trained yet."""
+    global _tagger, _tagger_loaded
+    if not _tagger_loaded:
+        _tagger_loaded = True
+        if os.path.exists(os.path.join(SKILL_TAGGER_PATH, "model.json")):
+            _tagger = SkillTagger.load()
+        else:
+            print(f"⚠️ No skill tagger at {SKILL_TAGGER_PATH}, using keyword maps only")
+    return _tagger
+
+
+def with_tagger(extractor):
+    """Wrap a keyword extractor with the tagger when a model is available."""
+    tagger = get_tagger()
+    return TaggerExtractor(extractor, tagger) if tagger is not None else extractor
+
+
+# ---------------- TRAINING ----------------
+def training_data(path=TRAINING_CSV):
+    """(titles, canonical tag lists) for the listings that have tags."""
+    df = pd.read_csv(path, usecols=["title", "skills_final"])
+    df = df[df["title"].notna()]
+    tags = df["skills_final"].map(parse_skill_list).map(canonical_skills)
+    keep = tags.map(len).gt(0)
+    return df.loc[keep, "title"].astype(str).tolist(), tags[keep].tolist()
+
+
+def fit(titles, tags, min_examples=MIN_LABEL_EXAMPLES):
+    counts = pd.Series([t for ts in tags for t in ts]).value_counts()
+    labels = set(counts[counts >= min_examples].index)
+    binarizer = MultiLabelBinarizer(classes=sorted(labels))
+    targets = binarizer.fit_transform([[t for t in ts if t in labels] for ts in tags])
+
+    vectorizer = HashingVectorizer(**VECTORIZER)
+    classifier = OneVsRestClassifier(LogisticRegression(C=4.0, max_iter=1000))
+    classifier.fit(vectorizer.transform(titles), targets)
+
+    return {
+        "labels": [str(label) for label in binarizer.classes_],
+        "weights": np.vstack([e.coef_ for e in classifier.estimators_]).astype(np.float32),
+        "intercepts": np.concatenate([e.intercept_ for e in classifier.estimators_]).astype(np.float32),
+        "vectorizer": VECTORIZER,
+    }
+
+
+def evaluate(model, titles, tags, threshold):
+    """Micro precision / recall of the tagger's labels on held-out rows."""
+    tagger = SkillTagger(model, threshold)
+    known = set(tagger.labels)
+    hits = predicted = expected = 0
+    for guess, truth in zip(tagger.predict(titles), tags):
+        truth = {t for t in truth if t in known}
+        hits += len(truth.intersection(guess))
+        predicted += len(guess)
+        expected += len(truth)
+    return hits / max(predicted, 1), hits / max(expected, 1)
+
+
+def title_split(titles, test_size=0.2):
+    """
+    Train / test row indexes with every distinct title on one side only:
+    titles repeat across listings, and a row split would score the model
+    on titles it was trained on.
+    """
+    groups = [" ".join(t.lower().split()) for t in titles]
+    splitter = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=0)
+    return next(splitter.split(titles, groups=groups))
+
+
+def main():
+    start = time.perf_counter()
+    titles, tags = training_data()
+    print(f"🧠 Training skill tagger on {len(titles)} tagged listings ({len(set(titles))} distinct titles)")
+
+    train, test = title_split(titles)
+    held_out = fit([titles[i] for i in train], [tags[i] for i in train])
+    best = (-1.0, DEFAULT_THRESHOLD)
+    for threshold in THRESHOLDS:
+        precision, recall = evaluate(
+            held_out, [titles[i] for i in test], [tags[i] for i in test], threshold
+        )
+        f1 = 2 * precision * recall / max(precision + recall, 1e-9)
+        print(f"   threshold {threshold:.2f}: precision {precision:.2f}, recall {recall:.2f}, F1 {f1:.2f}")
+        best = max(best, (f1, threshold))
+    print(f"📊 Threshold {best[1]:.2f} (best F1 {best[0]:.2f} on titles not seen in training)")
+
+    model = fit(titles, tags)
+    model["threshold"] = best[1]
+    save(model)
+    print(
+        f"✅ Saved {len(model['labels'])} labels to {SKILL_TAGGER_PATH} "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
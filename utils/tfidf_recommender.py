@@ -0,0 +1,215 @@
+import os
+import threading
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from utils.db import get_db
+from utils.catalog import get_catalog_version
+from utils.skill_index import normalize_skill, normalize_location
+from utils.skills.parsing import parse_skill_list
+
+# Interests are softer signals than declared skills.
+INTEREST_WEIGHT = float(os.getenv("TFIDF_INTEREST_WEIGHT", "0.5"))
+
+
+def _identity(tokens):
+    # documents are already lists of normalized skills
+    return tokens
+
+
+class _TfidfState:
+    """Immutable snapshot; build() makes a new one and swaps it in."""
+
+    def __init__(self, vectorizer, matrix, ids, created, locations, meta):
+        self.vectorizer = vectorizer
+        self.matrix = matrix        # csr (n_internships x n_skills)
+        self.ids = ids
+        self.created = created
+        self.locations = locations
+        self.remote = np.array([loc.startswith("remote") for loc in locations], dtype=bool)
+        self.meta = meta            # (title, organization, location) per row
+
+        # locations as small ints so the eligibility mask is an int compare
+        self.location_codes = {}
+        self.location_ids = np.array(
+            [self.location_codes.setdefault(loc, len(self.location_codes)) for loc in locations],
+            dtype=np.int32,
+        )
+
+        # 0/1 copy of the matrix for shared-skill counts
+        self.binary = (matrix > 0).astype(np.int32).tocsr()
+        # created_at rank scaled to [0, 1): newest listing is closest to 1
+        ranks = np.argsort(np.argsort(created, kind="stable"), kind="stable")
+        self.recency = ranks / max(len(created), 1)
+
+
+class TfidfRecommender:
+    """
+    Ranks the whole catalog with one sparse product.
+
+    Internships are rows of an l2-normalised internship x skill TF-IDF
+    matrix built from skills_final, so rare skills weigh more than
+    "Python". A user is the same kind of vector (skills + weighted
+    interests); cosine scores are X @ q for one user or Q @ X.T for a
+    batch of users.
+    """
+
+    def __init__(self):
+        self._state = _TfidfState(
+            None, sparse.csr_matrix((0, 0)), np.empty(0, dtype=np.int64),
+            np.empty(0), np.empty(0, dtype=object), [],
+        )
+        self.version = None
+        self._lock = threading.Lock()
+
+    # ---------- building ----------
+    def build(self, version=None):
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, title, organization, location,
+                       EXTRACT(EPOCH FROM created_at), skills_final
+                FROM internships
+                ORDER BY id
+                """
+            )
+            rows = cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
+
+        docs = [[normalize_skill(s) for s in parse_skill_list(r[5])] for r in rows]
+
+        vectorizer = TfidfVectorizer(
+            analyzer=_identity,
+            lowercase=False,
+            sublinear_tf=True,
+        )
+        if any(docs):
+            matrix = vectorizer.fit_transform(docs).tocsr()
+        else:
+            vectorizer = None
+            matrix = sparse.csr_matrix((len(rows), 0))
+
+        state = _TfidfState(
+            vectorizer,
+            matrix,
+            np.array([r[0] for r in rows], dtype=np.int64),
+            np.array([float(r[4] or 0) for r in rows]),
+            np.array([normalize_location(r[3]) for r in rows], dtype=object),
+            [(r[1], r[2], r[3]) for r in rows],
+        )
+
+        with self._lock:
+            self._state = state
+            self.version = version
+
+    def refresh(self):
+        version = get_catalog_version()
+        if version != self.version:
+            self.build(version)
+
+    # ---------- query vectors ----------
+    @staticmethod
+    def _query_matrix(state, users):
+        """
+        users: iterable of (skills, interests). Returns a csr matrix with
+        one l2-normalised row per user.
+        """
+        users = list(users)
+        if state.vectorizer is None:
+            return sparse.csr_matrix((len(users), state.matrix.shape[1]))
+
+        skills = [[normalize_skill(s) for s in u[0]] for u in users]
+        interests = [[normalize_skill(i) for i in u[1]] for u in users]
+
+        q = state.vectorizer.transform(skills)
+        if INTEREST_WEIGHT:
+            q = q + INTEREST_WEIGHT * state.vectorizer.transform(interests)
+        return normalize(q.tocsr())
+
+    @staticmethod
+    def _eligible(state, locations):
+        """(n_users x n_internships) mask: same location, or remote."""
+        user_codes = np.array(
+            [state.location_codes.get(normalize_location(l), -1) for l in locations],
+            dtype=np.int32,
+        )
+        same = user_codes[:, None] == state.location_ids[None, :]
+        return same | state.remote[None, :]
+
+    @staticmethod
+    def _top_rows(state, scores, q, k):
+        n_items = scores.shape[1]
+        k = min(k, n_items)
+
+        # newest-first tie-break folded into the score as a tiny bonus,
+        # so top-k is one argpartition + a k-wide sort for the whole chunk
+        keyed = scores + state.recency * 1e-9
+        part = np.argpartition(-keyed, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(keyed, part, axis=1), axis=1)
+        top = np.take_along_axis(part, order, axis=1)
+
+        # number of shared terms, skills and weighted-in interests alike
+        # (shown on the dashboard card), for every user x internship pair
+        # in one binary sparse product
+        shared = ((q > 0).astype(np.int32) @ state.binary.T).tocsr()
+
+        results = []
+        for row, (row_top, row_scores) in enumerate(zip(top, scores)):
+            rows = []
+            for idx in row_top:
+                if not np.isfinite(row_scores[idx]):
+                    break
+                title, organization, location = state.meta[idx]
+                rows.append({
+                    "id": int(state.ids[idx]),
+                    "title": title,
+                    "organization": organization,
+                    "location": location,
+                    "match_score": int(shared[row, idx]),
+                    "score": round(float(row_scores[idx]), 4),
+                })
+            results.append(rows)
+        return results
+
+    # ---------- scoring ----------
+    def recommend(self, skills, interests, location, k=5):
+        """One user: a single sparse mat-vec over the catalog."""
+        return self.recommend_many([(skills, interests, location)], k)[0]
+
+    def recommend_many(self, users, k=5, chunk_size=2000):
+        """
+        users: list of (skills, interests, location, ...) tuples; fields
+        past location (rank_internships passes skill_ids) are ignored.
+        Scores users in chunks with one sparse mat-mat product per chunk.
+        match_score counts the catalog terms an internship shares with the
+        user's skills and (when INTEREST_WEIGHT is set) interests.
+        """
+        state = self._state
+        users = list(users)
+        results = []
+        if not len(state.ids):
+            return [[] for _ in users]
+
+        for start in range(0, len(users), chunk_size):
+            chunk = users[start:start + chunk_size]
+            q = self._query_matrix(state, ((u[0], u[1]) for u in chunk))
+
+            scores = (q @ state.matrix.T).toarray()
+            scores[~self._eligible(state, [u[2] for u in chunk])] = -np.inf
+
+            results.extend(self._top_rows(state, scores, q, k))
+        return results
+
+
+# ---------------- PER-WORKER ENGINE ----------------
+_recommender = TfidfRecommender()
+
+
+def get_tfidf_recommender():
+    _recommender.refresh()
+    return _recommender
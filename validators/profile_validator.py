@@ -1,5 +1,6 @@
 # validators/profile_validator.py
 from datetime import datetime
+from utils.skills.dictionary import canonical_skills
 
 ALLOWED = {
     # "education_level": {"high school", "diploma", "undergraduate", "postgraduate"},
@@ -76,12 +77,13 @@ def validate_profile_payload(data: dict):
     if year < threshold or year > 2035:
         raise ValidationError("INVALID_GRADUATION_YEAR")
 
-    # Normalize lists
-    skills = [
+    # Normalize lists; skills use the canonical dictionary names, so
+    # "ml" and "Machine Learning" count once
+    skills = canonical_skills(
         i.strip()
         for i in data.get("skills",[])
         if i.strip()
-    ]
+    )
 
     if not (MIN_SKILLS <= len(skills) <= MAX_SKILLS):
         raise ValidationError("INVALID_SKILLS_COUNT")